@@ -1,15 +1,11 @@
 from __future__ import annotations
 
-from functools import partial
 from typing import Dict, Tuple
 
 import pandas as pd
 
-from census_analysis.cell_matrix_calculator_utils import calculate_cell_matrix_property, calculate_cell_property
+from census_analysis.cell_matrix_calculator_utils import calculate_cell_matrix_from_msoa_attributes
 from census_analysis.dataset_loader import load_age_dataset_df
-from census_analysis.msoa_cache import CachedMSOA, prepare_msoa_caches
-from census_analysis.msoa_data import MSOA_DATA
-from noise.grid_generator import get_valid_cells
 
 AGE_CODE_ATTRIBUTE = "age_code_to_name"
 
@@ -29,12 +25,8 @@ AGE_BAND_DEFS: Dict[int, Tuple[int, int, str]] = {
 
 def calculate_cell_matrix_age() -> pd.DataFrame:
     age_pivot, band_code_to_name = _build_age_pivot()
-    prepared = prepare_msoa_caches(age_pivot, MSOA_DATA.msoa_index)
 
-    cells = get_valid_cells()
-    process_cell = partial(_annotate_cell_with_age, prepared=prepared)
-
-    df = calculate_cell_matrix_property(cells, process_cell)
+    df = calculate_cell_matrix_from_msoa_attributes(age_pivot)
     df.attrs[AGE_CODE_ATTRIBUTE] = band_code_to_name
     return df
 
@@ -73,11 +65,3 @@ def _build_age_pivot() -> Tuple[pd.DataFrame, Dict[int, str]]:
 
     band_code_to_name = {bid: label for bid, (_, _, label) in AGE_BAND_DEFS.items()}
     return pivot, band_code_to_name
-
-
-def _annotate_cell_with_age(cell: dict, prepared: CachedMSOA) -> dict:
-    totals = calculate_cell_property(cell["geometry"], prepared)
-    out = dict(cell)
-    for code in prepared.codes:
-        out[code] = totals[code]
-    return out
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import astuple, dataclass
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import psutil
+import shapely
+from scipy import sparse
+from tqdm import tqdm
+
+from census_analysis.msoa_data import MSOA_DATASET_PATH, MSOAData, get_msoa_data
+from common.file_utils import calculate_file_hash, path_exists, save_arrays_as_npz
+from common.model_configs import model_config
+from common.path_configs import PATH_CONFIGS
+from noise.grid_generator import LONDON_BOUNDARIES_PATH, build_cell_geometries, get_valid_cells
+
+CELL_SIZE = model_config.grid.noise_cell_m
+BOUNDARIES = model_config.map_boundaries
+
+CACHE_KEY_LENGTH = 16
+
+OVERLAY_CHUNK_SIZE = 4096
+
+
+@dataclass(frozen=True)
+class CellMSOAOverlay:
+    cells: pd.DataFrame          # geometry, row, col of every valid grid cell, in grid order
+    msoa_codes: np.ndarray
+    weights: sparse.csr_matrix   # (cells x MSOAs) share of each MSOA's area that falls inside each cell
+
+    def aggregate(self, msoa_attributes: pd.DataFrame) -> np.ndarray:
+        # MSOAs missing from the attribute table contribute nothing, attribute rows without a polygon are dropped
+        aligned = msoa_attributes.reindex(self.msoa_codes).fillna(0.0)
+        return np.asarray(self.weights @ aligned.to_numpy(dtype=np.float64))
+
+
+def build_cell_msoa_overlay(
+    cells: list[dict],
+    msoa_data: MSOAData,
+    max_workers: int = 1,
+    chunk_size: int = OVERLAY_CHUNK_SIZE,
+) -> CellMSOAOverlay:
+    cell_geometries = np.array([cell["geometry"] for cell in cells], dtype=object)
+
+    if max_workers > 1 and len(cells) > chunk_size:
+        cell_positions, msoa_positions, intersection_fractions = _intersect_in_processes(
+            cell_geometries, msoa_data, max_workers, chunk_size
+        )
+    else:
+        cell_positions, msoa_positions, intersection_fractions = _intersect_cells_with_msoas(cell_geometries, msoa_data)
+
+    weights = sparse.csr_matrix(
+        (intersection_fractions, (cell_positions, msoa_positions)),
+        shape=(len(cells), len(msoa_data.msoa_codes)),
+    )
+
+    return CellMSOAOverlay(
+        cells=pd.DataFrame(cells, columns=["geometry", "row", "col"]),
+        msoa_codes=msoa_data.msoa_codes,
+        weights=weights,
+    )
+
+
+def get_physical_core_count() -> int:
+    return psutil.cpu_count(logical=False) or psutil.cpu_count() or 1
+
+
+def _intersect_cells_with_msoas(
+    cell_geometries: np.ndarray,
+    msoa_data: MSOAData,
+    first_cell_position: int = 0,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # one bulk tree query yields every intersecting (cell, MSOA) pair instead of testing all MSOAs per cell
+    cell_positions, msoa_positions = msoa_data.tree.query(cell_geometries, predicate="intersects")
+
+    intersection_areas = shapely.area(
+        shapely.intersection(cell_geometries[cell_positions], msoa_data.msoa_polygons[msoa_positions])
+    )
+    intersection_fractions = intersection_areas / msoa_data.msoa_areas[msoa_positions]
+
+    overlapping = intersection_fractions > 0
+    return (
+        cell_positions[overlapping] + first_cell_position,
+        msoa_positions[overlapping],
+        intersection_fractions[overlapping],
+    )
+
+
+def _intersect_in_processes(
+    cell_geometries: np.ndarray,
+    msoa_data: MSOAData,
+    max_workers: int,
+    chunk_size: int,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    chunks = [
+        (start, cell_geometries[start:start + chunk_size])
+        for start in range(0, len(cell_geometries), chunk_size)
+    ]
+
+    # every worker receives the MSOA data once and builds its own tree, chunks only carry cell boxes
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_overlay_worker,
+        initargs=(msoa_data,),
+    ) as executor:
+        chunk_results = list(tqdm(executor.map(_intersect_cell_chunk, chunks), total=len(chunks), desc="Overlaying cells"))
+
+    return tuple(np.concatenate(columns) for columns in zip(*chunk_results))
+
+
+_WORKER_MSOA_DATA: MSOAData | None = None
+
+
+def _init_overlay_worker(msoa_data: MSOAData):
+    global _WORKER_MSOA_DATA
+    _WORKER_MSOA_DATA = msoa_data
+
+
+def _intersect_cell_chunk(chunk: tuple[int, np.ndarray]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    first_cell_position, cell_geometries = chunk
+    return _intersect_cells_with_msoas(cell_geometries, _WORKER_MSOA_DATA, first_cell_position)
+
+
+def build_overlay_cache_key(
+    msoa_dataset_path: str = MSOA_DATASET_PATH,
+    boundaries_path: str = LONDON_BOUNDARIES_PATH,
+) -> str:
+    # the weights depend on the grid layout, the valid-cell boundary and the MSOA polygons themselves
+    key_parts = (
+        CELL_SIZE,
+        astuple(BOUNDARIES),
+        calculate_file_hash(msoa_dataset_path),
+        calculate_file_hash(boundaries_path),
+    )
+    return hashlib.sha256(repr(key_parts).encode()).hexdigest()[:CACHE_KEY_LENGTH]
+
+
+def save_cell_msoa_overlay(overlay: CellMSOAOverlay, file_path: str):
+    weights = overlay.weights.tocsr()
+
+    save_arrays_as_npz(
+        file_path,
+        data=weights.data,
+        indices=weights.indices,
+        indptr=weights.indptr,
+        shape=np.array(weights.shape),
+        rows=overlay.cells["row"].to_numpy(),
+        cols=overlay.cells["col"].to_numpy(),
+        msoa_codes=overlay.msoa_codes,
+    )
+
+
+def load_cell_msoa_overlay(file_path: str) -> CellMSOAOverlay:
+    with np.load(file_path) as stored:
+        weights = sparse.csr_matrix(
+            (stored["data"], stored["indices"], stored["indptr"]),
+            shape=tuple(stored["shape"]),
+        )
+        rows, cols = stored["rows"], stored["cols"]
+        msoa_codes = stored["msoa_codes"]
+
+    cells = pd.DataFrame({
+        "geometry": build_cell_geometries(rows, cols),
+        "row": rows,
+        "col": cols,
+    })
+    return CellMSOAOverlay(cells=cells, msoa_codes=msoa_codes, weights=weights)
+
+
+@lru_cache(maxsize=1)
+def get_cell_msoa_overlay() -> CellMSOAOverlay:
+    file_path = PATH_CONFIGS.cell_msoa_weights_path(CELL_SIZE, build_overlay_cache_key())
+    if path_exists(file_path):
+        return load_cell_msoa_overlay(file_path)
+
+    overlay = build_cell_msoa_overlay(get_valid_cells(), get_msoa_data(), max_workers=get_physical_core_count())
+
+    try:
+        save_cell_msoa_overlay(overlay, file_path)
+        print(f"Cell/MSOA weights saved to '{file_path}'.")
+    except OSError as e:
+        print(f"Error saving cell/MSOA weights to '{file_path}': {e}")
+
+    return overlay
@@ -0,0 +1,10 @@
+import pandas as pd
+
+from census_analysis.age_data_processor.age_cell_matrix_calculator import calculate_cell_matrix_age
+from census_analysis.ethnicity_data_processor.ethnicity_cell_matrix_calculator import calculate_cell_matrix_ethnicity
+from census_analysis.population_data_processor.cell_matrix_population_calculator import calculate_cell_matrix_population
+
+
+def calculate_census_cell_matrices() -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    # all three share the cached cell/MSOA overlay, so the geometry is intersected only once
+    return calculate_cell_matrix_population(), calculate_cell_matrix_age(), calculate_cell_matrix_ethnicity()
@@ -1,46 +1,172 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+
+import numpy as np
+import shapely
+from shapely import STRtree
 from shapely.geometry import shape
 
-from common.file_utils import load_json
-from common.path_configs import PATH_CONFIGS
+from common.file_utils import is_cache_fresh, load_data_from_pickle, load_json, save_data_as_pickle_highest_protocol
+from common.path_configs import PATH_CONFIGS, get_msoa_dataset_cache_file
 
 MSOA_DATASET_PATH = PATH_CONFIGS.msoa_population_path
 
+TRIANGLE_VERTICES = 3
+MAX_SAMPLING_ATTEMPTS = 10000
 
-class MSOAData:
-    def __init__(self):
-        self.msoa_index, self.msoa_populations = self._build_msoa_index()
-        self.population_distribution = self._calculate_population_distribution()
 
-    @staticmethod
-    def _build_msoa_index(msoa_dataset_path=MSOA_DATASET_PATH):
-        geojson_data = load_json(msoa_dataset_path)
+@dataclass(frozen=True)
+class MSOASamplingTable:
+    """
+    Delaunay triangles covering one MSOA polygon, for uniform point sampling without a bounding-box scan.
+    Triangles that only partly overlap the polygon keep their full area as weight and are sampled with
+    rejection, so accepted points stay uniform over the polygon.
+    """
+    triangles: np.ndarray            # (T, 3, 2) triangle vertices as (easting, northing)
+    cumulative_weights: np.ndarray   # (T,) cumulative triangle areas, normalised to end at 1.0
+    fully_inside: np.ndarray         # (T,) triangles lying entirely inside the polygon need no containment test
+    polygon: object                  # polygon the table was built for, repaired with buffer(0) when invalid
 
-        msoa_dict = {}
-        msoa_populations = {}
 
-        for feature in geojson_data['features']:
-            msoa_code = feature['properties'].get('msoa21cd', '').strip()
-            population = feature['properties'].get('population', None)
+class MSOAData:
+    def __init__(self, msoa_dataset_path: str = MSOA_DATASET_PATH):
+        self.msoa_codes, self.msoa_polygons, self.population_counts = self._load_msoa_records(msoa_dataset_path)
 
-            polygon = shape(feature['geometry'])
+        self.msoa_index = dict(zip(self.msoa_codes.tolist(), self.msoa_polygons))
+        self.msoa_populations = dict(zip(self.msoa_codes.tolist(), self.population_counts.tolist()))
+        self.msoa_positions = {msoa_code: position for position, msoa_code in enumerate(self.msoa_codes.tolist())}
 
-            if population is not None:
-                msoa_dict[msoa_code] = polygon
-                msoa_populations[msoa_code] = population
+    @cached_property
+    def tree(self) -> STRtree:
+        return STRtree(self.msoa_polygons)
 
-        return msoa_dict, msoa_populations
+    @cached_property
+    def msoa_areas(self) -> np.ndarray:
+        return shapely.area(self.msoa_polygons)
 
-    def _calculate_population_distribution(self):
-        total_population = sum(self.msoa_populations.values())
+    @cached_property
+    def cumulative_population(self) -> np.ndarray:
+        total_population = self.population_counts.sum()
         if total_population == 0:
             raise ValueError("Total population is zero, cannot generate weighted points.")
 
-        cumulative = 0.0
-        distribution = []
-        for msoa_code, msoa_population in self.msoa_populations.items():
-            cumulative += msoa_population / total_population
-            distribution.append((msoa_code, cumulative))
-        return distribution
+        return np.cumsum(self.population_counts / total_population)
+
+    @property
+    def population_distribution(self) -> list[tuple[str, float]]:
+        return list(zip(self.msoa_codes.tolist(), self.cumulative_population.tolist()))
+
+    @cached_property
+    def sampling_tables(self) -> list[MSOASamplingTable | None]:
+        return [_build_sampling_table(polygon) for polygon in self.msoa_polygons]
+
+    def query(self, geometry, predicate: str | None = "intersects") -> np.ndarray:
+        return self.tree.query(geometry, predicate=predicate)
+
+    def find_msoa_by_population_share(self, population_share: float) -> str | None:
+        position = int(np.searchsorted(self.cumulative_population, population_share, side="left"))
+        if position == len(self.msoa_codes):
+            return None
+
+        return str(self.msoa_codes[position])
+
+    def sample_point(self, msoa_code: str, random_source) -> tuple[float, float]:
+        position = self.msoa_positions[msoa_code]
+        sampling_table = self.sampling_tables[position]
+
+        if sampling_table is None:
+            return _centroid_coordinates(self.msoa_polygons[position])
+
+        for _ in range(MAX_SAMPLING_ATTEMPTS):
+            triangle_position = int(np.searchsorted(sampling_table.cumulative_weights, random_source.random(), side="right"))
+            triangle_position = min(triangle_position, len(sampling_table.triangles) - 1)
+
+            x, y = _sample_in_triangle(sampling_table.triangles[triangle_position], random_source)
+            if sampling_table.fully_inside[triangle_position] or shapely.contains_xy(sampling_table.polygon, x, y):
+                return x, y
+
+        print(msoa_code)
+        return _centroid_coordinates(sampling_table.polygon)
+
+    @staticmethod
+    def _load_msoa_records(msoa_dataset_path: str) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        cache_path = get_msoa_dataset_cache_file(msoa_dataset_path)
+
+        if is_cache_fresh(cache_path, msoa_dataset_path):
+            msoa_codes, polygons_wkb, population_counts = load_data_from_pickle(cache_path)
+            return msoa_codes, shapely.from_wkb(polygons_wkb), population_counts
+
+        msoa_codes, polygons, population_counts = _parse_msoa_records(msoa_dataset_path)
+
+        try:
+            save_data_as_pickle_highest_protocol((msoa_codes, shapely.to_wkb(polygons), population_counts), cache_path)
+        except OSError as e:
+            print(f"Error saving MSOA cache to '{cache_path}': {e}")
+
+        return msoa_codes, polygons, population_counts
+
+
+def _parse_msoa_records(msoa_dataset_path: str) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    geojson_data = load_json(msoa_dataset_path)
+
+    records = {}
+    for feature in geojson_data['features']:
+        msoa_code = feature['properties'].get('msoa21cd', '').strip()
+        population = feature['properties'].get('population', None)
+
+        if population is not None:
+            records[msoa_code] = (feature['geometry'], population)
+
+    msoa_codes = np.array(list(records), dtype=str)
+    polygons = np.array([shape(geometry) for geometry, _ in records.values()], dtype=object)
+    population_counts = np.array([population for _, population in records.values()], dtype=np.float64)
+
+    return msoa_codes, polygons, population_counts
+
+
+def _build_sampling_table(polygon) -> MSOASamplingTable | None:
+    if not polygon.is_valid:
+        polygon = polygon.buffer(0)
+
+    if not polygon.is_valid or polygon.area == 0:
+        return None
+
+    triangles = np.asarray(shapely.get_parts(shapely.delaunay_triangles(polygon)))
+    overlap_areas = shapely.area(shapely.intersection(triangles, polygon))
+    triangle_areas = shapely.area(triangles)
+
+    # the Delaunay triangles cover the convex hull, so only the ones touching the polygon are worth sampling
+    overlapping = overlap_areas > 0
+    triangles = triangles[overlapping]
+    triangle_areas = triangle_areas[overlapping]
+
+    vertices = shapely.get_coordinates(shapely.get_exterior_ring(triangles)).reshape(len(triangles), -1, 2)
+
+    return MSOASamplingTable(
+        triangles=vertices[:, :TRIANGLE_VERTICES],
+        cumulative_weights=np.cumsum(triangle_areas) / triangle_areas.sum(),
+        fully_inside=np.isclose(overlap_areas[overlapping], triangle_areas),
+        polygon=polygon,
+    )
+
+
+def _sample_in_triangle(triangle: np.ndarray, random_source) -> tuple[float, float]:
+    u, v = random_source.random(), random_source.random()
+    if u + v > 1.0:
+        u, v = 1.0 - u, 1.0 - v
+
+    a, b, c = triangle
+    point = a + u * (b - a) + v * (c - a)
+    return float(point[0]), float(point[1])
+
+
+def _centroid_coordinates(polygon) -> tuple[float, float]:
+    centroid = polygon.centroid
+    return centroid.x, centroid.y
 
 
-MSOA_DATA = MSOAData()
+@lru_cache(maxsize=1)
+def get_msoa_data() -> MSOAData:
+    return MSOAData()
@@ -29,3 +29,16 @@ class OrderDatasetType(Enum):
     RANDOM = "random"
     FURTHEST = "furthest"
     CLOSEST = "closest"
+
+
+class CacheEvictionPolicy(Enum):
+    LRU = "lru"
+    LFU = "lfu"
+
+
+class NoiseEngineType(Enum):
+    EXACT = "exact"
+    FFT = "fft"
+    TREE = "tree"
+    ADAPTIVE = "adaptive"
+    TILED = "tiled"
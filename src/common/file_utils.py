@@ -1,9 +1,10 @@
+import hashlib
 import json
 import os
 import pickle
+from contextlib import contextmanager
 
-import networkx as nx
-import osmnx as ox
+import numpy as np
 import pandas as pd
 
 
@@ -29,7 +30,45 @@ def save_data_as_pickle(data, file_path, protocol=None):
         pickle.dump(data, file=file, protocol=protocol)
 
 
+def save_arrays_as_npz(file_path, **arrays):
+    # written to a temporary file first, so readers in other processes never see a half-written archive
+    os.makedirs(os.path.dirname(file_path) or '.', exist_ok=True)
+    tmp_path = f"{file_path}.{os.getpid()}.tmp"
+
+    with open(tmp_path, 'wb') as file:
+        np.savez(file, **arrays)
+    os.replace(tmp_path, file_path)
+
+
+@contextmanager
+def exclusive_file_lock(lock_path):
+    """Blocks until this process holds an exclusive lock on lock_path, across processes on the same host."""
+    os.makedirs(os.path.dirname(str(lock_path)) or '.', exist_ok=True)
+
+    with open(lock_path, 'a+b') as lock_file:
+        if os.name == 'nt':
+            import msvcrt
+
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
 def save_graph_as_graphml(graph_to_save, file_path):
+    import networkx as nx
+
     nx.write_graphml(graph_to_save, file_path)
 
 
@@ -47,6 +86,8 @@ def save_graph(graph, file_path):
 
 
 def load_graphml_graph(file_path):
+    import osmnx as ox
+
     try:
         graph_from_graphml = ox.load_graphml(file_path)
         print(f"Graph loaded from '{file_path}' successfully.")
@@ -99,6 +140,24 @@ def path_exists(path, suffixes=None):
     return any(os.path.exists(path + s) for s in suffixes)
 
 
+def is_cache_fresh(cache_path, source_path):
+    if not os.path.exists(cache_path):
+        return False
+
+    if not os.path.exists(source_path):
+        return True
+
+    return os.path.getmtime(cache_path) >= os.path.getmtime(source_path)
+
+
+def calculate_file_hash(file_path, chunk_size=1024 * 1024):
+    file_hash = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
 def ensure_suffix(line, suffix):
     if not line.endswith(suffix):
         return line + suffix
@@ -6,6 +6,9 @@ from typing import List
 
 from common.warehouse_configs import Warehouses
 
+# default length of the time windows the per-cell drone Leq is reported for
+NOISE_WINDOW_S = 3600
+
 
 @dataclass(frozen=True)
 class MapBoundaries:
@@ -60,3 +63,11 @@ class ModelConfig:
 
 
 model_config = ModelConfig()
+
+
+def validate_noise_window(window_s: int):
+    # columns are named after the window start in whole minutes, and every tick has to fall in one window
+    if window_s <= 0 or window_s % 60 or window_s % model_config.time.step_s:
+        raise ValueError(
+            f"Noise window of {window_s} s must be a positive multiple of 60 s and of the {model_config.time.step_s} s time step"
+        )
@@ -11,6 +11,9 @@ class PathsConfiguration:
     base_noise_dir: str = f"{data_dir}/base_noise"
     noise_graph_navigation_dir: str = f"{data_dir}/noise_graph_navigation"
     experiment_results_dir: str = "recourses/experiment_results"
+    planned_route_cache_dir: str = f"{data_dir}/planned_route_cache"
+    cell_msoa_weights_dir: str = f"{data_dir}/cell_msoa_weights"
+    trajectory_log_dir: str = f"{data_dir}/trajectory_logs"
 
     msoa_population_path: str = f"{data_dir}/MSOA_population_dataset_filtered.geojson"
     london_boundaries_path: str = f"{data_dir}/greater-london-boundaries.geo.json"
@@ -38,6 +41,9 @@ class PathsConfiguration:
     def warehouse_paths_cache(self) -> str:
         return f"{self.noise_graph_navigation_dir}/warehouse_paths_cache.pkl"
 
+    def cell_msoa_weights_path(self, noise_cell_size_meters: int, cache_key: str) -> str:
+        return f"{self.cell_msoa_weights_dir}/cell_msoa_weights_{noise_cell_size_meters}_{cache_key}.npz"
+
     @staticmethod
     def cell_population_path(noise_cell_size_meters: int) -> str:
         return f"recourses/data/cell_population_{noise_cell_size_meters}.pkl"
@@ -75,5 +81,19 @@ def get_mixed_order_dataset_pattern(random_ratio: int, closest_ratio: int, stock
 def get_noise_navigation_route_orders_file(file_path: str) -> str:
     return file_path.replace(".csv", "_routes.pkl")
 
+def get_base_noise_levels_cache_file(file_path: str) -> str:
+    return file_path.replace(".geojson", "_levels.npz")
+
+def get_msoa_dataset_cache_file(file_path: str) -> str:
+    return file_path.replace(".geojson", "_cache.pkl")
+
 def get_experiment_results_full_file_path(file_name: str) -> str:
     return ensure_suffix(f"{PATH_CONFIGS.experiment_results_dir}/{file_name}", ".pkl")
+
+
+def get_trajectory_log_directory(config_hash: str) -> str:
+    return f"{PATH_CONFIGS.trajectory_log_dir}/{config_hash}"
+
+
+def get_experiment_results_store_directory(file_name: str) -> str:
+    return f"{PATH_CONFIGS.experiment_results_dir}/{file_name.removesuffix('.pkl')}"
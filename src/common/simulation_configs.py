@@ -1,15 +1,25 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, replace
+import hashlib
+from dataclasses import dataclass, fields, replace
 
-from common.enum import NavigationType
+from common.enum import NavigationType, NoiseEngineType
+from common.model_configs import NOISE_WINDOW_S, model_config, validate_noise_window
 from common.path_configs import ORDER_BASE_PATH_RANDOM
 
+# switches that only change what a run prints or draws, never its results
+RESULT_INDEPENDENT_FIELDS = ("plot_map", "print_model_stats", "profile_phases", "record_trajectory", "pipeline_noise")
+# switches that only change how the captured drone positions are turned into noise, never the positions
+NOISE_MODEL_FIELDS = ("noise_engine", "use_route_footprints", "noise_window_s")
+CONFIG_HASH_LENGTH = 16
+
 
 @dataclass(frozen=True)
 class SimulationConfig:
     plot_map: bool = False
     print_model_stats: bool = True
+    profile_phases: bool = False
+    record_trajectory: bool = False
 
     orders_in_dataset: int = 100_000
     orders_to_process: int = 100_000
@@ -18,11 +28,38 @@ class SimulationConfig:
     drone_landing: bool = False
 
     navigator_type: NavigationType = NavigationType.STRAIGHT
+    noise_engine: NoiseEngineType = NoiseEngineType.EXACT
+    # sums cached per-leg footprints instead of evaluating every tick; only the day-level average_noise is
+    # produced (maximum_noise is NaN), the L-levels, minutes_above_* and windowed averages are left out
+    use_route_footprints: bool = False
+    # accumulates noise on a background thread while the simulation runs, instead of after it
+    pipeline_noise: bool = False
+    # length of the time windows the per-cell drone Leq is also reported for
+    noise_window_s: int = NOISE_WINDOW_S
 
     order_dataset_path: str = ORDER_BASE_PATH_RANDOM
 
+    def __post_init__(self):
+        validate_noise_window(self.noise_window_s)
+
     def with_overrides(self, **kwargs) -> "SimulationConfig":
         return replace(self, **kwargs)
 
+    def result_hash(self) -> str:
+        return self._hash_fields_except(RESULT_INDEPENDENT_FIELDS)
+
+    def trajectory_hash(self) -> str:
+        """Key of the drone trajectories a run produces, shared by runs that only differ in their noise model."""
+        return self._hash_fields_except(RESULT_INDEPENDENT_FIELDS + NOISE_MODEL_FIELDS)
+
+    def _hash_fields_except(self, excluded_fields: tuple[str, ...]) -> str:
+        hashed_fields = tuple(
+            (config_field.name, getattr(self, config_field.name))
+            for config_field in fields(self)
+            if config_field.name not in excluded_fields
+        )
+        # the model constants are part of the key, so changing e.g. the time step invalidates earlier runs
+        return hashlib.sha256(repr((hashed_fields, model_config)).encode()).hexdigest()[:CONFIG_HASH_LENGTH]
+
 
 DEFAULT_SIMULATION_CONFIGS = SimulationConfig()
\ No newline at end of file
@@ -3,6 +3,7 @@ from __future__ import annotations
 from common.coordinate import Coordinate
 from common.enum import DroneStatus
 from orders.order import Order
+from route_planner.planned_route import EMPTY_ROUTE, PlannedRoute
 
 
 class Drone:
@@ -17,37 +18,28 @@ class Drone:
         self.order = None
         self.status = DroneStatus.FREE
         self.need_planning = True
-        self.route: list[Coordinate] = []
-        self.altitudes: list[float] = []
+        self.route: PlannedRoute = EMPTY_ROUTE
+        self.waypoint_index = 0
 
-        self._pending_return_route: list[Coordinate] = []
-        self._pending_return_altitudes: list[float] = []
+        self._pending_return_route: PlannedRoute | None = None
 
-    def assign_route(self, route, altitudes):
+    def assign_route(self, route):
         self.route = route
-        self.altitudes = altitudes
+        self.waypoint_index = 0
 
         self.need_planning = False
 
-    def set_pending_return_leg(self, route, altitudes):
+    def set_pending_return_leg(self, route):
         self._pending_return_route = route
-        self._pending_return_altitudes = altitudes
 
     def pop_pending_return_leg(self):
-        if not self._pending_return_route:
-            return None
-
         route = self._pending_return_route
-        altitudes = self._pending_return_altitudes
-
-        self._pending_return_route = []
-        self._pending_return_altitudes = []
+        self._pending_return_route = None
 
-        return route, altitudes
+        return route
 
     def clear_pending_return_leg(self):
-        self._pending_return_route = []
-        self._pending_return_altitudes = []
+        self._pending_return_route = None
 
     def accept_order(self, order: Order):
         self.clear_pending_return_leg()
@@ -73,14 +65,17 @@ class Drone:
         self.clear_pending_return_leg()
 
     def drone_has_route(self):
-        return bool(self.route)
-                
+        return self.waypoint_index < len(self.route)
+
     def move_to_next_waypoint(self):
-        self.current_location = self.route.pop(0)
-        self.current_altitude = self.altitudes.pop(0)
-    
+        northing, easting, altitude = self.route[self.waypoint_index]
+        self.waypoint_index += 1
+
+        self.current_location = Coordinate(float(northing), float(easting))
+        self.current_altitude = float(altitude)
+
     def has_reached_destination(self):
-        return self.destination is not None and not self.route
+        return self.destination is not None and not self.drone_has_route()
 
     def update_status_on_reach(self):
         match self.status:
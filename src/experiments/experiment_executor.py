@@ -15,14 +15,22 @@ import psutil
 
 from common.coordinate import Coordinate
 from common.enum import NavigationType
-from common.file_utils import load_dataframe_from_pickle, save_dataframe_to_pickle
-from common.path_configs import get_experiment_results_full_file_path
+from common.file_utils import load_dataframe_from_pickle
+from common.model_configs import model_config
+from common.path_configs import get_experiment_results_full_file_path, get_experiment_results_store_directory
 from common.runtime_configs import use_simulation_config
 from common.simulation_configs import SimulationConfig
-from noise.navigator import clear_navigator_cache
-from simulation.planned_route_cache import PlannedRouteCache, PlannedRouteCacheStats
+from experiments.experiment_results_store import ExperimentResultsStore
+from noise.navigator import clear_navigator_cache, get_navigator_weight_id
+from noise.route_footprint_cache import RouteFootprintCache
+from simulation.planned_route_cache import PlannedRouteCache, PlannedRouteCacheLimits, PlannedRouteCacheStats
+from simulation.planned_route_store import PersistentPlannedRouteStore, PlannedRouteNamespace
+from simulation.phase_profiler import PhaseProfiler
 from simulation.simulator import Simulator
-from visualiser.plot_utils import finalise_visualisation
+
+PLANNED_ROUTE_CACHE_LIMITS = PlannedRouteCacheLimits(max_bytes=2 * 1024 ** 3)
+PERSIST_PLANNED_ROUTES = True
+ROUTE_FOOTPRINT_CACHE_MAX_BYTES = 1024 ** 3
 
 
 @dataclass(frozen=True)
@@ -93,21 +101,43 @@ def run_complex_experiment(
     experiment_function=None,
     visualisation_function=None,
     configs_with_names=None,
+    planned_route_cache_limits: PlannedRouteCacheLimits = PLANNED_ROUTE_CACHE_LIMITS,
+    persist_planned_routes: bool = PERSIST_PLANNED_ROUTES,
 ):
+    results_store = ExperimentResultsStore(get_experiment_results_store_directory(result_file_name))
+
     if configs_with_names is not None:
         def wrapped_experiment():
-            return _run_experiments_for_configs(configs_with_names)
+            return _run_experiments_for_configs(
+                configs_with_names,
+                planned_route_cache_limits,
+                persist_planned_routes,
+                results_store=results_store,
+            )
         experiment_function = wrapped_experiment
 
     if experiment_function is None:
         raise ValueError("Either experiment_function or configs_with_names must be provided")
 
-    results = _load_or_run_experiment(result_file_name, load_saved_results, experiment_function)
+    results = _load_or_run_experiment(
+        result_file_name,
+        load_saved_results,
+        experiment_function,
+        results_store,
+        checkpointed=configs_with_names is not None,
+        run_names=[run_name for run_name, _ in configs_with_names] if configs_with_names is not None else None,
+    )
     _visualise_results(results, visualisation_function, result_file_name=result_file_name)
 
 
-def _run_experiments_for_configs(configs_with_names):
-    grouped_configs = _group_by_navigation_type_and_dataset(configs_with_names)
+def _run_experiments_for_configs(
+    configs_with_names,
+    planned_route_cache_limits: PlannedRouteCacheLimits = PLANNED_ROUTE_CACHE_LIMITS,
+    persist_planned_routes: bool = PERSIST_PLANNED_ROUTES,
+    results_store: ExperimentResultsStore | None = None,
+):
+    pending_configs = _skip_completed_runs(configs_with_names, results_store)
+    grouped_configs = _group_by_navigation_type_and_dataset(pending_configs)
 
     results = []
     for navigation_type_name in sorted(grouped_configs.keys()):
@@ -123,12 +153,37 @@ def _run_experiments_for_configs(configs_with_names):
                     navigation_type_name=navigation_type_name,
                     dataset_group_key=dataset_group_key,
                     runs=dataset_runs,
+                    planned_route_cache_limits=planned_route_cache_limits,
+                    persist_planned_routes=persist_planned_routes,
+                    results_store=results_store,
                 )
             )
 
         _clear_navigation_level_caches(navigation_type_name)
 
-    return results
+    if results_store is None:
+        return results
+
+    # runs finished by earlier invocations are read back, so the caller always sees the full sweep
+    return results_store.load_results(run_names=[run_name for run_name, _ in configs_with_names])
+
+
+def _skip_completed_runs(configs_with_names, results_store: ExperimentResultsStore | None):
+    if results_store is None:
+        return list(configs_with_names)
+
+    completed_runs = results_store.completed_runs()
+    pending_configs = [
+        (run_name, config)
+        for run_name, config in configs_with_names
+        if completed_runs.get(run_name) != config.result_hash()
+    ]
+
+    skipped_count = len(configs_with_names) - len(pending_configs)
+    if skipped_count:
+        print(f"Skipping {skipped_count} completed runs, {len(pending_configs)} left to run.")
+
+    return pending_configs
 
 
 def _group_by_navigation_type_and_dataset(configs_with_names):
@@ -153,8 +208,20 @@ def _run_dataset_group(
     navigation_type_name: str,
     dataset_group_key: DatasetExperimentGroupKey,
     runs: list[tuple[str, SimulationConfig]],
+    planned_route_cache_limits: PlannedRouteCacheLimits = PLANNED_ROUTE_CACHE_LIMITS,
+    persist_planned_routes: bool = PERSIST_PLANNED_ROUTES,
+    results_store: ExperimentResultsStore | None = None,
 ):
-    planned_route_cache = _create_planned_route_cache(navigation_type_name)
+    planned_route_cache = _create_planned_route_cache(
+        navigation_type_name,
+        limits=planned_route_cache_limits,
+        persistent_store=_create_persistent_route_store(
+            runs=runs,
+            drone_landing=dataset_group_key.drone_landing_enabled,
+            enabled=persist_planned_routes,
+        ),
+    )
+    route_footprint_cache = _create_route_footprint_cache(runs)
     ordered_runs = _sort_runs_by_descending_drone_count(runs)
     memory_monitor = ProcessMemoryMonitor()
 
@@ -176,14 +243,20 @@ def _run_dataset_group(
     memory_monitor.start()
     try:
         for run_name, config in ordered_runs:
-            dataset_results.append(
-                _run_atomic_experiment(
-                    run_name=run_name,
-                    config=config,
-                    planned_route_cache=planned_route_cache,
-                    warehouse_locations=active_warehouse_locations,
-                )
+            run_result = _run_atomic_experiment(
+                run_name=run_name,
+                config=config,
+                planned_route_cache=planned_route_cache,
+                warehouse_locations=active_warehouse_locations,
+                route_footprint_cache=route_footprint_cache,
             )
+            _flush_planned_route_cache(planned_route_cache)
+
+            if results_store is not None:
+                # checkpoint every run as soon as it finishes, a crash later in the sweep keeps it
+                results_store.save_run(run_result)
+            else:
+                dataset_results.append(run_result)
     finally:
         memory_usage_summary = memory_monitor.stop()
         cache_stats = _get_planned_route_cache_stats(planned_route_cache)
@@ -194,6 +267,7 @@ def _run_dataset_group(
             memory_usage_summary=memory_usage_summary,
         )
         _clear_planned_route_cache(planned_route_cache)
+        _clear_route_footprint_cache(route_footprint_cache)
         _log_memory_after_cache_cleanup(
             navigation_type_name=navigation_type_name,
             dataset_group_key=dataset_group_key,
@@ -220,10 +294,61 @@ def _load_active_warehouse_locations(dataset_path: str, number_of_orders: int) -
     return warehouse_locations
 
 
-def _create_planned_route_cache(navigation_type_name: str) -> PlannedRouteCache | None:
+def _create_planned_route_cache(
+    navigation_type_name: str,
+    limits: PlannedRouteCacheLimits = PLANNED_ROUTE_CACHE_LIMITS,
+    persistent_store: PersistentPlannedRouteStore | None = None,
+) -> PlannedRouteCache | None:
     if navigation_type_name == NavigationType.STRAIGHT.name:
         return None
-    return PlannedRouteCache()
+    return PlannedRouteCache(limits=limits, persistent_store=persistent_store)
+
+
+def _create_persistent_route_store(
+    runs: list[tuple[str, SimulationConfig]],
+    drone_landing: bool,
+    enabled: bool = PERSIST_PLANNED_ROUTES,
+) -> PersistentPlannedRouteStore | None:
+    if not enabled or not runs:
+        return None
+
+    navigation_type = runs[0][1].navigator_type
+    if navigation_type == NavigationType.STRAIGHT:
+        return None
+
+    namespace = PlannedRouteNamespace(
+        navigation_type=_nav_to_name(navigation_type),
+        weight_id=get_navigator_weight_id(navigation_type),
+        drone_landing=drone_landing,
+        time_step_s=model_config.time.step_s,
+        speed_mps=model_config.drone.speed_mps,
+        nav_cell_m=model_config.grid.nav_cell_m,
+    )
+    return PersistentPlannedRouteStore(namespace)
+
+
+def _create_route_footprint_cache(runs: list[tuple[str, SimulationConfig]]) -> RouteFootprintCache | None:
+    # every run of a dataset group flies the same legs, so their footprints are shared across the group
+    if not any(config.use_route_footprints for _, config in runs):
+        return None
+    return RouteFootprintCache(max_bytes=ROUTE_FOOTPRINT_CACHE_MAX_BYTES)
+
+
+def _clear_route_footprint_cache(route_footprint_cache: RouteFootprintCache | None):
+    if route_footprint_cache is None:
+        return
+
+    print(
+        f"  Route footprint cache: entries={route_footprint_cache.entry_count}, "
+        f"size={_format_bytes(route_footprint_cache.byte_size)}, "
+        f"hits={route_footprint_cache.hit_count}, misses={route_footprint_cache.miss_count}"
+    )
+    route_footprint_cache.clear()
+
+
+def _flush_planned_route_cache(planned_route_cache: PlannedRouteCache | None):
+    if planned_route_cache is not None:
+        planned_route_cache.flush()
 
 
 def _sort_runs_by_descending_drone_count(runs):
@@ -238,6 +363,7 @@ def _run_atomic_experiment(
     config: SimulationConfig,
     planned_route_cache: PlannedRouteCache | None = None,
     warehouse_locations=None,
+    route_footprint_cache: RouteFootprintCache | None = None,
 ):
     start_time = time.time()
 
@@ -245,6 +371,7 @@ def _run_atomic_experiment(
         simulator_after_run = _run_simulation(
             planned_route_cache=planned_route_cache,
             warehouse_locations=warehouse_locations,
+            route_footprint_cache=route_footprint_cache,
         )
 
         elapsed_time = time.time() - start_time
@@ -256,10 +383,15 @@ def _run_atomic_experiment(
         )
 
 
-def _run_simulation(planned_route_cache: PlannedRouteCache | None = None, warehouse_locations=None):
+def _run_simulation(
+    planned_route_cache: PlannedRouteCache | None = None,
+    warehouse_locations=None,
+    route_footprint_cache: RouteFootprintCache | None = None,
+):
     simulator = Simulator(
         planned_route_cache=planned_route_cache,
         warehouse_locations=warehouse_locations,
+        route_footprint_cache=route_footprint_cache,
     )
     simulator.run()
     return simulator
@@ -278,10 +410,23 @@ def _extract_experiment_results(simulator_after_run, run_name, elapsed_time, con
         "num_drones": config.number_of_drones,
         "num_orders": config.orders_to_process,
         "navigation_type": _nav_to_name(config.navigator_type),
+        "config_hash": config.result_hash(),
         "avg_noise_diff": avg_noise_difference,
         "noise_impact_df": noise_impact_df,
         "delivered_orders_number": simulator_after_run.delivered_orders_number,
         "execution_time_seconds": elapsed_time,
+        **_extract_profiling_results(simulator_after_run.profiler),
+    }
+
+
+def _extract_profiling_results(profiler: PhaseProfiler | None) -> dict:
+    if profiler is None:
+        return {}
+
+    cache_usage = profiler.planner_cache_usage()
+    return {
+        "phase_profile": profiler.summary(),
+        "planner_cache_hit_rate": cache_usage.hit_rate if cache_usage is not None else None,
     }
 
 
@@ -310,10 +455,15 @@ def _log_dataset_group_summary(
         print(
             "  Planned route cache: "
             f"entries={cache_stats.entry_count}, "
+            f"size={_format_bytes(cache_stats.byte_size)}, "
             f"hits={cache_stats.hit_count}, "
             f"misses={cache_stats.miss_count}, "
             f"requests={cache_stats.request_count}, "
-            f"hit_rate={cache_stats.hit_rate:.2%}"
+            f"hit_rate={cache_stats.hit_rate:.2%}, "
+            f"evictions={cache_stats.eviction_count}, "
+            f"evicted={_format_bytes(cache_stats.evicted_bytes)}, "
+            f"disk_hits={cache_stats.disk_hit_count}, "
+            f"disk_entries={cache_stats.disk_entry_count}"
         )
 
     if memory_usage_summary is None:
@@ -385,28 +535,41 @@ def _format_bytes(size_in_bytes: int) -> str:
     return f"{negative_prefix}{absolute_size:.2f} {units[unit_index]}"
 
 
-def _load_or_run_experiment(result_file_name, load_saved_results, experiment_function):
-    file_path = get_experiment_results_full_file_path(result_file_name)
-
+def _load_or_run_experiment(
+    result_file_name,
+    load_saved_results,
+    experiment_function,
+    results_store: ExperimentResultsStore,
+    checkpointed: bool = False,
+    run_names: list[str] | None = None,
+):
     if load_saved_results:
         print(f"Loading results from file: {result_file_name}")
-        return _load_results(file_path)
+        return _load_results(results_store, get_experiment_results_full_file_path(result_file_name), run_names)
 
     print(f"Running experiment and saving results to: {result_file_name}")
-    return _run_and_store_experiment(experiment_function, file_path)
+    if checkpointed:
+        # the experiment already saved each run to the store as it completed
+        return _ensure_results_schema(_convert_results_to_dataframe(experiment_function()))
 
+    return _run_and_store_experiment(experiment_function, results_store)
 
-def _load_results(file_path):
-    df = load_dataframe_from_pickle(file_path)
+
+def _load_results(results_store: ExperimentResultsStore, legacy_file_path: str, run_names: list[str] | None = None):
+    if results_store.exists:
+        return _ensure_results_schema(results_store.load_results(run_names=run_names))
+
+    # experiments saved before the results store are a single pickled DataFrame
+    df = load_dataframe_from_pickle(legacy_file_path)
     return _ensure_results_schema(df)
 
 
-def _run_and_store_experiment(experiment_function, file_path):
+def _run_and_store_experiment(experiment_function, results_store: ExperimentResultsStore):
     raw_results = experiment_function()
     results_df = _convert_results_to_dataframe(raw_results)
     results_df = _ensure_results_schema(results_df)
 
-    save_dataframe_to_pickle(results_df, file_path)
+    results_store.save_results(results_df)
 
     return results_df
 
@@ -421,6 +584,9 @@ def _visualise_results(results, visualisation_function=None, result_file_name: s
     if visualisation_function is None:
         return
 
+    # matplotlib/seaborn (and the interactive backend) load only when results are actually plotted
+    from visualiser.plot_utils import finalise_visualisation
+
     print("Running visualisation on experiment results...")
     results = _ensure_results_schema(results)
     visualisation_function(results)
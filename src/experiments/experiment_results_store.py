@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from common.file_utils import exclusive_file_lock, save_arrays_as_npz
+
+RUN_METADATA_FILE = "runs.pkl"
+CELL_INDEX_FILE = "cells.npz"
+STORE_LOCK_FILE = "store.lock"
+RUN_METRICS_DIR = "run_metrics"
+
+CELL_FRAME_COLUMN = "noise_impact_df"
+METRICS_FILE_COLUMN = "metrics_file"
+CONFIG_HASH_COLUMN = "config_hash"
+CELL_KEY_COLUMNS = ["row", "col"]
+
+# identical in every run (base noise), so it is kept once next to the cell index
+SHARED_CELL_COLUMNS = ["noise_level"]
+# cell geometry is rebuilt on demand from the base noise file, never stored per run
+SKIPPED_CELL_COLUMNS = ["geometry"]
+
+_PRESENT_CELLS_KEY = "_present"
+# keeps run names that sanitize to the same text in separate files
+RUN_NAME_HASH_LENGTH = 8
+
+
+class ExperimentResultsStore:
+    """
+    On-disk layout of one experiment:
+      runs.pkl                   one metadata row per run (every scalar result field), keyed by run_name
+      cells.npz                  row/col of every cell seen by any run plus the shared base-noise columns
+      run_metrics/<run>.npz      one float array per cell metric, aligned to cells.npz
+      store.lock                 held by writers, so concurrent sweeps never lose each other's runs or cells
+
+    Per-run archives are loaded column by column, so readers only pay for the runs and metrics they use.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    @property
+    def exists(self) -> bool:
+        return self._metadata_path.exists()
+
+    @property
+    def run_names(self) -> list[str]:
+        return self.load_metadata()["run_name"].tolist()
+
+    def completed_runs(self) -> dict[str, str]:
+        metadata = self.load_metadata()
+        if CONFIG_HASH_COLUMN not in metadata.columns:
+            return {}
+
+        return dict(zip(metadata["run_name"], metadata[CONFIG_HASH_COLUMN]))
+
+    def save_results(self, results: pd.DataFrame):
+        # other sweep processes may checkpoint into the same store, so the read-modify-replace is serialised
+        with exclusive_file_lock(self._lock_path):
+            metadata = self.load_metadata()
+            cell_index = self._load_cell_index()
+
+            run_rows = []
+            for result in results.to_dict(orient="records"):
+                run_metadata, cell_index = self._save_run_cells(result, cell_index)
+                run_rows.append(run_metadata)
+
+            self._save_metadata(_replace_runs(metadata, pd.DataFrame(run_rows)))
+
+    def save_run(self, result: dict):
+        with exclusive_file_lock(self._lock_path):
+            run_metadata, _ = self._save_run_cells(result, self._load_cell_index())
+            self._save_metadata(_replace_runs(self.load_metadata(), pd.DataFrame([run_metadata])))
+
+    def load_metadata(self) -> pd.DataFrame:
+        if not self.exists:
+            return pd.DataFrame(columns=["run_name"])
+
+        return pd.read_pickle(self._metadata_path)
+
+    def load_results(
+        self,
+        run_names: list[str] | None = None,
+        columns: list[str] | None = None,
+        include_cell_metrics: bool = True,
+    ) -> pd.DataFrame:
+        metadata = self.load_metadata()
+        if run_names is not None:
+            metadata = metadata[metadata["run_name"].isin(run_names)].reset_index(drop=True)
+
+        if include_cell_metrics:
+            cell_index = self._load_cell_index()
+            metrics_files = metadata.get(METRICS_FILE_COLUMN, pd.Series(None, index=metadata.index, dtype=object))
+            metadata[CELL_FRAME_COLUMN] = [
+                self._load_metrics_file(metrics_file, cell_index, columns) for metrics_file in metrics_files
+            ]
+
+        return metadata.drop(columns=[METRICS_FILE_COLUMN], errors="ignore")
+
+    def load_cell_metrics(self, run_name: str, columns: list[str] | None = None) -> pd.DataFrame | None:
+        metadata = self.load_metadata()
+        if METRICS_FILE_COLUMN not in metadata.columns:
+            return None
+
+        matches = metadata.loc[metadata["run_name"] == run_name, METRICS_FILE_COLUMN]
+        if matches.empty:
+            return None
+
+        return self._load_metrics_file(matches.iloc[0], self._load_cell_index(), columns)
+
+    @property
+    def _metadata_path(self) -> Path:
+        return self.directory / RUN_METADATA_FILE
+
+    @property
+    def _cell_index_path(self) -> Path:
+        return self.directory / CELL_INDEX_FILE
+
+    @property
+    def _lock_path(self) -> Path:
+        return self.directory / STORE_LOCK_FILE
+
+    def _load_metrics_file(
+        self,
+        metrics_file: str | None,
+        cell_index: pd.DataFrame,
+        columns: list[str] | None,
+    ) -> pd.DataFrame | None:
+        if metrics_file is None or pd.isna(metrics_file):
+            return None
+
+        with np.load(self.directory / RUN_METRICS_DIR / metrics_file) as stored:
+            present = stored[_PRESENT_CELLS_KEY]
+            metric_columns = [name for name in stored.files if name != _PRESENT_CELLS_KEY]
+            cell_metrics = {
+                name: _pad_to_length(stored[name], len(present))
+                for name in metric_columns
+                if columns is None or name in columns
+            }
+
+        present_cells = cell_index.iloc[:len(present)][present].reset_index(drop=True)
+        for name, values in cell_metrics.items():
+            present_cells[name] = values[present]
+
+        if columns is not None:
+            kept = CELL_KEY_COLUMNS + [name for name in present_cells.columns if name in columns]
+            present_cells = present_cells[list(dict.fromkeys(kept))]
+
+        return present_cells
+
+    def _save_run_cells(self, result: dict, cell_index: pd.DataFrame) -> tuple[dict, pd.DataFrame]:
+        run_metadata = dict(result)
+        run_name = str(run_metadata["run_name"])
+
+        cell_frame = run_metadata.pop(CELL_FRAME_COLUMN, None)
+        if cell_frame is not None:
+            run_metadata[METRICS_FILE_COLUMN], cell_index = self._save_cell_metrics(run_name, cell_frame, cell_index)
+
+        return run_metadata, cell_index
+
+    def _save_cell_metrics(self, run_name: str, cell_frame: pd.DataFrame, cell_index: pd.DataFrame) -> tuple[str, pd.DataFrame]:
+        cell_frame = cell_frame.reset_index() if "row" not in cell_frame.columns else cell_frame
+        cell_positions, cell_index = self._align_to_cell_index(cell_frame, cell_index)
+        cell_count = len(cell_index)
+
+        present = np.zeros(cell_count, dtype=bool)
+        present[cell_positions] = True
+
+        stored_columns = [
+            name for name in cell_frame.columns
+            if name not in CELL_KEY_COLUMNS + SHARED_CELL_COLUMNS + SKIPPED_CELL_COLUMNS
+        ]
+        metric_columns = [name for name in stored_columns if pd.api.types.is_numeric_dtype(cell_frame[name])]
+
+        dropped_columns = [name for name in stored_columns if name not in metric_columns]
+        if dropped_columns:
+            print(f"Not storing non-numeric cell columns of run '{run_name}': {', '.join(map(str, dropped_columns))}")
+
+        metrics = {}
+        for name in metric_columns:
+            values = np.full(cell_count, np.nan, dtype=np.float64)
+            values[cell_positions] = cell_frame[name].to_numpy(dtype=np.float64)
+            metrics[name] = values
+
+        metrics_file = f"{_sanitize_file_name(run_name)}.npz"
+        save_arrays_as_npz(str(self.directory / RUN_METRICS_DIR / metrics_file), **{_PRESENT_CELLS_KEY: present}, **metrics)
+        return metrics_file, cell_index
+
+    def _align_to_cell_index(self, cell_frame: pd.DataFrame, cell_index: pd.DataFrame) -> tuple[np.ndarray, pd.DataFrame]:
+        shared_columns = [name for name in SHARED_CELL_COLUMNS if name in cell_frame.columns]
+        incoming_cells = cell_frame[CELL_KEY_COLUMNS + shared_columns].reset_index(drop=True)
+
+        cell_positions = pd.MultiIndex.from_frame(cell_index[CELL_KEY_COLUMNS]).get_indexer(
+            pd.MultiIndex.from_frame(incoming_cells[CELL_KEY_COLUMNS])
+        )
+
+        # cells no earlier run has seen are appended, older runs simply read them as absent
+        new_cells = cell_positions < 0
+        if new_cells.any():
+            cell_positions[new_cells] = len(cell_index) + np.arange(new_cells.sum())
+            cell_index = pd.concat([cell_index, incoming_cells[new_cells]], ignore_index=True)
+            self._save_cell_index(cell_index)
+
+        return cell_positions, cell_index
+
+    def _load_cell_index(self) -> pd.DataFrame:
+        if not self._cell_index_path.exists():
+            return pd.DataFrame({name: np.empty(0, dtype=np.int64) for name in CELL_KEY_COLUMNS})
+
+        with np.load(self._cell_index_path) as stored:
+            return pd.DataFrame({name: stored[name] for name in stored.files})
+
+    def _save_cell_index(self, cell_index: pd.DataFrame):
+        save_arrays_as_npz(
+            str(self._cell_index_path),
+            **{name: cell_index[name].to_numpy() for name in cell_index.columns},
+        )
+
+    def _save_metadata(self, metadata: pd.DataFrame):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._metadata_path.with_name(f"{RUN_METADATA_FILE}.{os.getpid()}.tmp")
+
+        metadata.to_pickle(tmp_path)
+        os.replace(tmp_path, self._metadata_path)
+
+
+def _replace_runs(metadata: pd.DataFrame, run_metadata: pd.DataFrame) -> pd.DataFrame:
+    if metadata.empty:
+        return run_metadata
+
+    kept_metadata = metadata[~metadata["run_name"].isin(run_metadata["run_name"])]
+    return pd.concat([kept_metadata, run_metadata], ignore_index=True)
+
+
+def _pad_to_length(values: np.ndarray, length: int) -> np.ndarray:
+    if len(values) >= length:
+        return values
+
+    return np.concatenate([values, np.full(length - len(values), np.nan)])
+
+
+def _sanitize_file_name(name: str) -> str:
+    readable_name = re.sub(r"[^A-Za-z0-9._-]+", "_", name).strip("_") or "run"
+    name_hash = hashlib.sha256(name.encode()).hexdigest()[:RUN_NAME_HASH_LENGTH]
+    return f"{readable_name}_{name_hash}"
@@ -0,0 +1,76 @@
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SOURCE_ROOT = Path(__file__).resolve().parents[2]
+
+# modules a headless simulation run must be able to import without loading any of the optional backends below
+SIMULATION_ENTRY_MODULES = (
+    "simulation.simulator",
+    "experiments.experiment_executor",
+)
+
+DEFERRED_MODULES = (
+    "folium",
+    "branca",
+    "osmnx",
+    "geopandas",
+    "matplotlib.pyplot",
+    "seaborn",
+    "networkx",
+)
+
+REPEATS = 5
+
+_IMPORT_PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+loaded = [name for name in {deferred!r} if name in sys.modules]
+print(elapsed)
+print(",".join(loaded))
+"""
+
+
+def measure_import(module: str) -> tuple[float, list[str]]:
+    # every probe runs in a fresh interpreter, so nothing is already cached in sys.modules
+    result = subprocess.run(
+        [sys.executable, "-c", _IMPORT_PROBE.format(module=module, deferred=DEFERRED_MODULES)],
+        cwd=SOURCE_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # the probe's own output is always the last two lines, whatever the imported modules print
+    elapsed, loaded = result.stdout.splitlines()[-2:]
+    return float(elapsed), [name for name in loaded.split(",") if name]
+
+
+def run_import_time_benchmark(modules=SIMULATION_ENTRY_MODULES, repeats=REPEATS) -> bool:
+    passed = True
+
+    for module in modules:
+        timings = []
+        loaded_deferred = set()
+
+        for _ in range(repeats):
+            elapsed, loaded = measure_import(module)
+            timings.append(elapsed)
+            loaded_deferred.update(loaded)
+
+        print(
+            f"{module}: median {statistics.median(timings):.3f}s, "
+            f"min {min(timings):.3f}s, max {max(timings):.3f}s over {repeats} runs"
+        )
+
+        if loaded_deferred:
+            passed = False
+            print(f"  eagerly loaded optional modules: {', '.join(sorted(loaded_deferred))}")
+
+    return passed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_import_time_benchmark() else 1)
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import numpy as np
+from numba import njit, prange
+
+from common.model_configs import NOISE_WINDOW_S, model_config, validate_noise_window
+
+HISTOGRAM_MIN_DB = 0.0
+HISTOGRAM_BIN_WIDTH_DB = 1.0
+HISTOGRAM_BIN_COUNT = 130
+
+EXCEEDANCE_THRESHOLDS_DB = (55.0, 65.0)
+PERCENTILE_LEVELS = (10, 50, 90)
+
+TICK_MINUTES = model_config.time.step_s / 60.0
+
+# a tick without drones is recorded as 0 dB, i.e. one unit of energy, in every cell
+EMPTY_TICK_ENERGY = 1.0
+
+
+@njit(parallel=True, nogil=True)
+def _accumulate_tick(levels_db, energies, window_energy_sums, maximum_levels, histograms, thresholds, exceedance_counts):
+    last_bin = histograms.shape[1] - 1
+
+    for i in prange(len(levels_db)):
+        level = levels_db[i]
+
+        window_energy_sums[i] += energies[i]
+        if level > maximum_levels[i]:
+            maximum_levels[i] = level
+
+        # clipped as a float first, so inf from a grounded drone on a centroid lands in the top bin
+        histogram_bin = min(max((level - HISTOGRAM_MIN_DB) / HISTOGRAM_BIN_WIDTH_DB, 0.0), last_bin)
+        histograms[i, int(histogram_bin)] += 1
+
+        # at or above, matching the lower-edge-inclusive histogram bins
+        for t in range(len(thresholds)):
+            if level >= thresholds[t]:
+                exceedance_counts[i, t] += 1
+
+
+class CellNoiseStatistics:
+    """
+    Constant-size per-cell summary of every tick's drone noise level: energy sums per time window behind
+    the windowed and day-level Leq, the maximum, a fixed-bin dB histogram and exact exceedance counters for
+    the configured thresholds. Percentiles and time above any other threshold are read from the histogram,
+    to bin resolution.
+    """
+
+    def __init__(self, num_cells: int, exceedance_thresholds=EXCEEDANCE_THRESHOLDS_DB, window_s: int = NOISE_WINDOW_S):
+        validate_noise_window(window_s)
+        self.tick_count = 0
+
+        self.window_s = window_s
+        num_windows = max(1, int(np.ceil((model_config.time.end_s - model_config.time.start_s) / window_s)))
+        self.window_energy_sums = np.zeros((num_windows, num_cells), dtype=np.float64)
+        self.window_tick_counts = np.zeros(num_windows, dtype=np.int64)
+
+        self.maximum_levels = np.zeros(num_cells, dtype=np.float64)
+        self.histograms = np.zeros((num_cells, HISTOGRAM_BIN_COUNT), dtype=np.int32)
+
+        self.exceedance_thresholds = np.array(exceedance_thresholds, dtype=np.float64)
+        self.exceedance_counts = np.zeros((num_cells, len(self.exceedance_thresholds)), dtype=np.int32)
+
+    def add_tick(self, levels_db: np.ndarray, energies: np.ndarray, tick_index: int | None = None):
+        # ticks are numbered from the start of the day, so a statistics object can cover a slice of the run
+        tick_index = self.tick_count if tick_index is None else tick_index
+        window = tick_index * model_config.time.step_s // self.window_s
+        if window >= len(self.window_tick_counts):
+            self._add_windows(window + 1 - len(self.window_tick_counts))
+
+        _accumulate_tick(
+            levels_db,
+            energies,
+            self.window_energy_sums[window],
+            self.maximum_levels,
+            self.histograms,
+            self.exceedance_thresholds,
+            self.exceedance_counts,
+        )
+        self.window_tick_counts[window] += 1
+        self.tick_count += 1
+
+    @property
+    def energy_sums(self) -> np.ndarray:
+        return self.window_energy_sums.sum(axis=0)
+
+    @property
+    def average_levels(self) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return 10.0 * np.log10(self.energy_sums / self.tick_count)
+
+    @property
+    def window_average_levels(self) -> np.ndarray:
+        """Leq per (window, cell); windows the run never reached are NaN."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            levels = 10.0 * np.log10(self.window_energy_sums / self.window_tick_counts[:, None])
+        levels[self.window_tick_counts == 0] = np.nan
+        return levels
+
+    @property
+    def window_start_seconds(self) -> np.ndarray:
+        return model_config.time.start_s + np.arange(len(self.window_tick_counts)) * self.window_s
+
+    def percentile_levels(self, exceeded_percent: float) -> np.ndarray:
+        """
+        L_N: the level each cell reaches exceeded_percent % of the time, as the lower edge of its bin. NaN
+        before the first tick.
+        """
+        if self.tick_count == 0:
+            return np.full(len(self.histograms), np.nan)
+
+        ticks_from_top = np.cumsum(self.histograms[:, ::-1], axis=1)
+        ranked_tick = max(1, int(np.ceil(exceeded_percent / 100.0 * self.tick_count)))
+
+        top_bin_offsets = np.argmax(ticks_from_top >= ranked_tick, axis=1)
+        bins = HISTOGRAM_BIN_COUNT - 1 - top_bin_offsets
+        return HISTOGRAM_MIN_DB + bins * HISTOGRAM_BIN_WIDTH_DB
+
+    def ticks_above(self, threshold_db: float | np.ndarray) -> np.ndarray:
+        """Ticks at or above threshold_db per cell, the same comparison the histogram bins and L-levels use."""
+        configured = np.flatnonzero(self.exceedance_thresholds == threshold_db) if np.isscalar(threshold_db) else []
+        if len(configured):
+            return self.exceedance_counts[:, configured[0]]
+
+        # whole bins at or above the threshold; per-cell thresholds are allowed, e.g. derived from base noise
+        first_bins = np.ceil((np.asarray(threshold_db, dtype=np.float64) - HISTOGRAM_MIN_DB) / HISTOGRAM_BIN_WIDTH_DB)
+        first_bins = np.broadcast_to(np.clip(first_bins, 0, HISTOGRAM_BIN_COUNT), (len(self.histograms),))
+
+        ticks_from_top = np.cumsum(self.histograms[:, ::-1], axis=1)[:, ::-1]
+        padded = np.concatenate([ticks_from_top, np.zeros((len(self.histograms), 1), dtype=ticks_from_top.dtype)], axis=1)
+        return padded[np.arange(len(self.histograms)), first_bins.astype(np.intp)]
+
+    def minutes_above(self, threshold_db: float | np.ndarray) -> np.ndarray:
+        return self.ticks_above(threshold_db) * TICK_MINUTES
+
+    def summary_columns(self) -> dict[str, np.ndarray]:
+        columns = {f"L{percent}": self.percentile_levels(percent) for percent in PERCENTILE_LEVELS}
+        for threshold in self.exceedance_thresholds.tolist():
+            columns[f"minutes_above_{threshold:g}"] = self.minutes_above(threshold)
+        return columns
+
+    def window_columns(self) -> dict[str, np.ndarray]:
+        return {
+            window_average_column(start_s): levels
+            for start_s, levels in zip(self.window_start_seconds.tolist(), self.window_average_levels)
+        }
+
+    def merge(self, other: CellNoiseStatistics):
+        """Adds the ticks summarised by other, e.g. a different slice of the same run."""
+        if len(other.window_tick_counts) > len(self.window_tick_counts):
+            self._add_windows(len(other.window_tick_counts) - len(self.window_tick_counts))
+
+        other_windows = len(other.window_tick_counts)
+        self.window_energy_sums[:other_windows] += other.window_energy_sums
+        self.window_tick_counts[:other_windows] += other.window_tick_counts
+        np.maximum(self.maximum_levels, other.maximum_levels, out=self.maximum_levels)
+        self.histograms += other.histograms
+        self.exceedance_counts += other.exceedance_counts
+        self.tick_count += other.tick_count
+
+    def _add_windows(self, count: int):
+        num_cells = self.window_energy_sums.shape[1]
+        self.window_energy_sums = np.vstack([self.window_energy_sums, np.zeros((count, num_cells))])
+        self.window_tick_counts = np.concatenate([self.window_tick_counts, np.zeros(count, dtype=np.int64)])
+
+
+def window_average_column(window_start_s: int) -> str:
+    hours, minutes = divmod(window_start_s // 60, 60)
+    return f"average_noise_{hours:02d}{minutes:02d}"
+
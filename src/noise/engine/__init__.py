@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from common.enum import NoiseEngineType
+
+if TYPE_CHECKING:
+    from noise.engine.noise_engine_base import NoiseEngine
+
+
+def get_noise_engine(engine_type: NoiseEngineType, cell_northings: np.ndarray, cell_eastings: np.ndarray) -> NoiseEngine:
+    # each engine pulls in its own numeric stack, so only the selected one is imported
+    if engine_type == NoiseEngineType.EXACT:
+        from noise.engine.exact_noise_engine import ExactNoiseEngine
+        return ExactNoiseEngine(cell_northings, cell_eastings)
+
+    if engine_type == NoiseEngineType.FFT:
+        from noise.engine.fft_noise_engine import FFTNoiseEngine
+        return FFTNoiseEngine(cell_northings, cell_eastings)
+
+    if engine_type == NoiseEngineType.TREE:
+        from noise.engine.tree_noise_engine import TreeNoiseEngine
+        return TreeNoiseEngine(cell_northings, cell_eastings)
+
+    if engine_type == NoiseEngineType.ADAPTIVE:
+        from noise.engine.adaptive_noise_engine import AdaptiveNoiseEngine, adaptive_split_pays_off
+        if adaptive_split_pays_off():
+            return AdaptiveNoiseEngine(cell_northings, cell_eastings)
+
+        print("The noise grid is too coarse for the adaptive engine to pay off, using the exact engine instead.")
+        return get_noise_engine(NoiseEngineType.EXACT, cell_northings, cell_eastings)
+
+    if engine_type == NoiseEngineType.TILED:
+        from noise.engine.tiled_noise_engine import TiledNoiseEngine
+        return TiledNoiseEngine(cell_northings, cell_eastings)
+
+    raise ValueError(f"Unknown noise engine: {engine_type}")
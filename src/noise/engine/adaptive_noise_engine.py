@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import numpy as np
+from numba import njit, prange
+
+from common.model_configs import model_config
+from noise.engine.exact_noise_engine import calculate_cells_noise_energy
+from noise.engine.noise_engine_base import NoiseEngine
+from noise.noise_math_utils import DRONE_SOURCE_ENERGY, calculate_distance
+
+CELL_SIZE = model_config.grid.noise_cell_m
+BOUNDARIES = model_config.map_boundaries
+
+# smoothing length a of the interpolated part of the kernel, tuned on a 100 m grid
+SMOOTHING_LENGTH_M = 800.0
+# the coarse lattice has a node every a / BLOCKS_PER_SMOOTHING_LENGTH metres, rounded down to whole cells
+BLOCKS_PER_SMOOTHING_LENGTH = 2
+# below this many cells per block the lattice is as fine as the grid and the split only adds work
+MIN_COARSE_STRIDE = 2
+# blocks whose centre level is further than this from the interpolated one are evaluated cell by cell
+MAX_INTERPOLATION_ERROR_DB = 0.1
+# the short-range remainder of a drone is dropped beyond the distance where leaving it out changes that
+# drone's level by at most this much, i.e. where 10 log10(1 + a² / d²) falls to it
+MAX_SHORT_RANGE_ERROR_DB = 0.12
+
+
+def coarse_stride_for(smoothing_length_m: float = SMOOTHING_LENGTH_M) -> int:
+    return int(smoothing_length_m // (BLOCKS_PER_SMOOTHING_LENGTH * CELL_SIZE))
+
+
+def adaptive_split_pays_off(smoothing_length_m: float = SMOOTHING_LENGTH_M) -> bool:
+    return coarse_stride_for(smoothing_length_m) >= MIN_COARSE_STRIDE
+
+
+class AdaptiveNoiseEngine(NoiseEngine):
+    """
+    Coarse-to-fine engine. The 1 / d² kernel is split into a smooth part 1 / (d² + a²), with a smoothing
+    length a of SMOOTHING_LENGTH_M, and the sharp remainder 1 / d² - 1 / (d² + a²). The smooth part is
+    evaluated on a lattice of cell centroids about a / 2 apart and interpolated bilinearly in dB inside each
+    block; blocks where a probe at the centre disagrees with the interpolation are refined cell by cell. The
+    remainder decays as 1 / d⁴ and is added exactly, but only for cells within a cutoff of each drone set by
+    MAX_SHORT_RANGE_ERROR_DB, so the per-cell work no longer grows with the whole fleet. It only pays off
+    on grids fine enough for blocks of several cells, see adaptive_split_pays_off.
+    """
+
+    def __init__(
+        self,
+        cell_northings: np.ndarray,
+        cell_eastings: np.ndarray,
+        smoothing_length_m: float = SMOOTHING_LENGTH_M,
+        max_interpolation_error_db: float = MAX_INTERPOLATION_ERROR_DB,
+        max_short_range_error_db: float = MAX_SHORT_RANGE_ERROR_DB,
+    ):
+        super().__init__(cell_northings, cell_eastings)
+        coarse_stride = max(1, coarse_stride_for(smoothing_length_m))
+        self.coarse_stride = coarse_stride
+        self.max_interpolation_error_db = max_interpolation_error_db
+
+        block_size = coarse_stride * CELL_SIZE
+        self.smoothing_length = smoothing_length_m
+        self.cutoff = smoothing_length_m / np.sqrt(10.0 ** (max_short_range_error_db / 10.0) - 1.0)
+
+        cell_rows = np.floor((cell_northings - BOUNDARIES.bottom) / CELL_SIZE).astype(np.intp)
+        cell_cols = np.floor((cell_eastings - BOUNDARIES.left) / CELL_SIZE).astype(np.intp)
+        self.num_block_rows = int(cell_rows.max()) // coarse_stride + 1
+        self.num_block_cols = int(cell_cols.max()) // coarse_stride + 1
+
+        # nodes sit on the centroids of cells 0, stride, 2 * stride, ... and close the last block even past the grid
+        node_northings = BOUNDARIES.bottom + (np.arange(self.num_block_rows + 1) * coarse_stride + 0.5) * CELL_SIZE
+        node_eastings = BOUNDARIES.left + (np.arange(self.num_block_cols + 1) * coarse_stride + 0.5) * CELL_SIZE
+        self.node_northings = np.repeat(node_northings, self.num_block_cols + 1)
+        self.node_eastings = np.tile(node_eastings, self.num_block_rows + 1)
+
+        # one probe per block centre, where bilinear interpolation is least constrained by the corners
+        probe_northings = node_northings[:-1] + block_size / 2
+        probe_eastings = node_eastings[:-1] + block_size / 2
+        self.probe_northings = np.repeat(probe_northings, self.num_block_cols)
+        self.probe_eastings = np.tile(probe_eastings, self.num_block_rows)
+
+        self.cell_block_rows, row_offsets = np.divmod(cell_rows, coarse_stride)
+        self.cell_block_cols, col_offsets = np.divmod(cell_cols, coarse_stride)
+        self.cell_blocks = self.cell_block_rows * self.num_block_cols + self.cell_block_cols
+        self.cell_row_fractions = row_offsets / coarse_stride
+        self.cell_col_fractions = col_offsets / coarse_stride
+
+    def calculate_energy(self, drone_northings, drone_eastings, drone_altitudes):
+        if len(drone_northings) == 0:
+            return np.zeros(len(self.cell_northings), dtype=np.float64)
+
+        # 1 / (r² + h² + a²) is the exact kernel for a drone lifted to sqrt(h² + a²)
+        smoothed_altitudes = np.sqrt(drone_altitudes ** 2 + self.smoothing_length ** 2)
+
+        total_energy = self._interpolate_smooth_energy(drone_northings, drone_eastings, smoothed_altitudes)
+        total_energy += self._short_range_energy(drone_northings, drone_eastings, drone_altitudes)
+
+        return total_energy
+
+    def _interpolate_smooth_energy(self, drone_northings, drone_eastings, smoothed_altitudes) -> np.ndarray:
+        node_levels = 10.0 * np.log10(calculate_cells_noise_energy(
+            self.node_northings,
+            self.node_eastings,
+            drone_northings,
+            drone_eastings,
+            smoothed_altitudes,
+        )).reshape(self.num_block_rows + 1, self.num_block_cols + 1)
+
+        bottom_left = node_levels[:-1, :-1]
+        bottom_right = node_levels[:-1, 1:]
+        top_left = node_levels[1:, :-1]
+        top_right = node_levels[1:, 1:]
+
+        rows, cols = self.cell_block_rows, self.cell_block_cols
+        row_fractions, col_fractions = self.cell_row_fractions, self.cell_col_fractions
+        cell_levels = (
+            (1.0 - row_fractions) * ((1.0 - col_fractions) * bottom_left[rows, cols] + col_fractions * bottom_right[rows, cols])
+            + row_fractions * ((1.0 - col_fractions) * top_left[rows, cols] + col_fractions * top_right[rows, cols])
+        )
+        smooth_energy = 10.0 ** (cell_levels / 10.0)
+
+        probe_levels = 10.0 * np.log10(calculate_cells_noise_energy(
+            self.probe_northings,
+            self.probe_eastings,
+            drone_northings,
+            drone_eastings,
+            smoothed_altitudes,
+        ))
+        interpolated_probe_levels = ((bottom_left + bottom_right + top_left + top_right) / 4.0).ravel()
+        inaccurate_blocks = np.abs(probe_levels - interpolated_probe_levels) > self.max_interpolation_error_db
+        refined_cells = np.flatnonzero(inaccurate_blocks[self.cell_blocks])
+
+        if len(refined_cells):
+            smooth_energy[refined_cells] = calculate_cells_noise_energy(
+                self.cell_northings[refined_cells],
+                self.cell_eastings[refined_cells],
+                drone_northings,
+                drone_eastings,
+                smoothed_altitudes,
+            )
+
+        return smooth_energy
+
+    def _short_range_energy(self, drone_northings, drone_eastings, drone_altitudes) -> np.ndarray:
+        # drones are binned on a cutoff-sized lattice, so every cell only visits its own and the eight adjacent bins
+        bin_rows = np.floor((drone_northings - BOUNDARIES.bottom) / self.cutoff).astype(np.int64)
+        bin_cols = np.floor((drone_eastings - BOUNDARIES.left) / self.cutoff).astype(np.int64)
+        first_row, first_col = bin_rows.min(), bin_cols.min()
+        num_bin_rows = int(bin_rows.max() - first_row) + 1
+        num_bin_cols = int(bin_cols.max() - first_col) + 1
+
+        drone_bins = (bin_rows - first_row) * num_bin_cols + (bin_cols - first_col)
+        drone_order = np.argsort(drone_bins, kind="stable")
+        bin_starts = np.searchsorted(drone_bins[drone_order], np.arange(num_bin_rows * num_bin_cols + 1))
+
+        return _calculate_short_range_energy(
+            self.cell_northings,
+            self.cell_eastings,
+            drone_northings[drone_order],
+            drone_eastings[drone_order],
+            drone_altitudes[drone_order],
+            bin_starts,
+            BOUNDARIES.bottom + first_row * self.cutoff,
+            BOUNDARIES.left + first_col * self.cutoff,
+            num_bin_rows,
+            num_bin_cols,
+            self.cutoff,
+            self.smoothing_length ** 2,
+        )
+
+
+@njit(parallel=True, nogil=True, error_model="numpy")
+def _calculate_short_range_energy(
+    cell_northings,
+    cell_eastings,
+    drone_northings,
+    drone_eastings,
+    drone_altitudes,
+    bin_starts,
+    bins_bottom,
+    bins_left,
+    num_bin_rows,
+    num_bin_cols,
+    cutoff,
+    squared_smoothing_length,
+):
+    num_cells = len(cell_northings)
+    total_energy_result = np.zeros(num_cells, dtype=np.float64)
+    squared_cutoff = cutoff * cutoff
+
+    for i in prange(num_cells):
+        centroid_northing = cell_northings[i]
+        centroid_easting = cell_eastings[i]
+        cell_bin_row = int(np.floor((centroid_northing - bins_bottom) / cutoff))
+        cell_bin_col = int(np.floor((centroid_easting - bins_left) / cutoff))
+
+        energy = 0.0
+        for bin_row in range(max(cell_bin_row - 1, 0), min(cell_bin_row + 2, num_bin_rows)):
+            for bin_col in range(max(cell_bin_col - 1, 0), min(cell_bin_col + 2, num_bin_cols)):
+                drone_bin = bin_row * num_bin_cols + bin_col
+                for j in range(bin_starts[drone_bin], bin_starts[drone_bin + 1]):
+                    squared_distance = calculate_distance(
+                        centroid_northing - drone_northings[j],
+                        centroid_easting - drone_eastings[j],
+                        drone_altitudes[j],
+                    )
+                    if squared_distance < squared_cutoff:
+                        energy += DRONE_SOURCE_ENERGY * (
+                            1.0 / squared_distance - 1.0 / (squared_distance + squared_smoothing_length)
+                        )
+
+        total_energy_result[i] = energy
+
+    return total_energy_result
@@ -0,0 +1,44 @@
+import numpy as np
+from numba import njit, prange
+
+from noise.engine.noise_engine_base import NoiseEngine
+from noise.noise_math_utils import calculate_distance, calculate_energy_at_distance
+
+
+# numpy error model: a grounded drone exactly on a centroid yields inf energy instead of raising;
+# nogil lets a pipelined noise worker run while the simulation thread keeps moving drones
+@njit(parallel=True, nogil=True, error_model="numpy")
+def calculate_cells_noise_energy(cell_northings, cell_eastings, drone_northings, drone_eastings, drone_altitudes):
+    num_cells = len(cell_northings)
+    num_drones = len(drone_northings)
+
+    total_energy_result = np.zeros(num_cells, dtype=np.float64)
+
+    # summing source energy / squared distance directly, instead of going through dB for every drone
+    for i in prange(num_cells):
+        centroid_northings = cell_northings[i]
+        centroid_eastings = cell_eastings[i]
+
+        energy = 0.0
+        for j in range(num_drones):
+            delta_northing = centroid_northings - drone_northings[j]
+            delta_easting = centroid_eastings - drone_eastings[j]
+
+            distance = calculate_distance(delta_northing, delta_easting, drone_altitudes[j])
+
+            energy += calculate_energy_at_distance(distance)
+
+        total_energy_result[i] = energy
+
+    return total_energy_result
+
+
+class ExactNoiseEngine(NoiseEngine):
+    def calculate_energy(self, drone_northings, drone_eastings, drone_altitudes):
+        return calculate_cells_noise_energy(
+            self.cell_northings,
+            self.cell_eastings,
+            drone_northings,
+            drone_eastings,
+            drone_altitudes,
+        )
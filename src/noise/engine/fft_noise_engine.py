@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import numpy as np
+from scipy import fft
+
+from common.model_configs import model_config
+from noise.engine.exact_noise_engine import calculate_cells_noise_energy
+from noise.engine.noise_engine_base import NoiseEngine
+from noise.grid_generator import compute_grid_dimensions
+from noise.noise_math_utils import DRONE_SOURCE_ENERGY
+
+CELL_SIZE = model_config.grid.noise_cell_m
+BOUNDARIES = model_config.map_boundaries
+
+# drones are splatted bilinearly onto a SUBCELL_FACTOR x SUBCELL_FACTOR lattice inside each noise cell
+SUBCELL_FACTOR = 5
+ALTITUDE_BAND_M = 10.0
+# below this the 1 / (r² + h²) peak is narrower than the sub-cell lattice can resolve
+MIN_SPLAT_ALTITUDE_M = CELL_SIZE / SUBCELL_FACTOR / 2
+
+
+class FFTNoiseEngine(NoiseEngine):
+    """
+    Per-tick noise energy as a convolution of the drone-count raster with the 1 / (r² + h²) kernel, so the
+    cost per tick depends on the grid size rather than on the fleet size.
+
+    Drones are accumulated per (altitude band, sub-cell offset) raster, each raster has its own precomputed
+    kernel spectrum, and all products are summed in the frequency domain before a single inverse FFT.
+    Each drone's energy is shared bilinearly between its four nearest sub-cell centres, and altitudes are
+    rounded to the nearest band. Drones in the low landing phases and drones too close to the raster edge
+    to splat are added with the exact kernel.
+    """
+
+    def __init__(self, cell_northings: np.ndarray, cell_eastings: np.ndarray):
+        super().__init__(cell_northings, cell_eastings)
+
+        self.num_rows, self.num_cols = compute_grid_dimensions()
+        self.cell_rows = np.floor((cell_northings - BOUNDARIES.bottom) / CELL_SIZE).astype(np.intp)
+        self.cell_cols = np.floor((cell_eastings - BOUNDARIES.left) / CELL_SIZE).astype(np.intp)
+
+        # circular convolution only has to avoid wrapping into the rows/cols that are read back
+        self.fft_shape = (
+            fft.next_fast_len(2 * self.num_rows - 1, real=True),
+            fft.next_fast_len(2 * self.num_cols - 1, real=True),
+        )
+        self._kernel_spectra: dict[int, np.ndarray] = {}
+
+    def calculate_energy(self, drone_northings, drone_eastings, drone_altitudes):
+        subcell_size = CELL_SIZE / SUBCELL_FACTOR
+        # continuous sub-cell coordinates, measured from the centre of the first sub-cell
+        subcell_rows = (drone_northings - BOUNDARIES.bottom) / subcell_size - 0.5
+        subcell_cols = (drone_eastings - BOUNDARIES.left) / subcell_size - 0.5
+
+        # a drone is splatted onto its four surrounding sub-cell centres, which must all be on the raster
+        inside = (
+            (subcell_rows >= 0) & (subcell_rows < self.num_rows * SUBCELL_FACTOR - 1)
+            & (subcell_cols >= 0) & (subcell_cols < self.num_cols * SUBCELL_FACTOR - 1)
+            & (drone_altitudes >= MIN_SPLAT_ALTITUDE_M)
+        )
+
+        total_energy = self._convolve_drone_rasters(
+            *_bilinear_splats(subcell_rows[inside], subcell_cols[inside], _altitude_bands(drone_altitudes[inside]))
+        )
+
+        if not inside.all():
+            outside = ~inside
+            total_energy += calculate_cells_noise_energy(
+                self.cell_northings,
+                self.cell_eastings,
+                drone_northings[outside],
+                drone_eastings[outside],
+                drone_altitudes[outside],
+            )
+
+        return total_energy
+
+    def _convolve_drone_rasters(self, subcell_rows, subcell_cols, altitude_bands, splat_weights) -> np.ndarray:
+        if len(subcell_rows) == 0:
+            return np.zeros(len(self.cell_northings), dtype=np.float64)
+
+        cell_rows, row_offsets = np.divmod(subcell_rows, SUBCELL_FACTOR)
+        cell_cols, col_offsets = np.divmod(subcell_cols, SUBCELL_FACTOR)
+        raster_positions = cell_rows * self.num_cols + cell_cols
+
+        group_keys, group_indices = np.unique(
+            (altitude_bands * SUBCELL_FACTOR + row_offsets) * SUBCELL_FACTOR + col_offsets, return_inverse=True
+        )
+
+        # one weighted drone raster per group, transformed together as a single batch
+        rasters = np.bincount(
+            group_indices * (self.num_rows * self.num_cols) + raster_positions,
+            weights=splat_weights,
+            minlength=len(group_keys) * self.num_rows * self.num_cols,
+        ).reshape(len(group_keys), self.num_rows, self.num_cols)
+        raster_spectra = fft.rfft2(rasters, s=self.fft_shape)
+
+        energy_spectrum = np.zeros(raster_spectra.shape[1:], dtype=np.complex128)
+        for raster_spectrum, group_key in zip(raster_spectra, group_keys.tolist()):
+            energy_spectrum += raster_spectrum * self._kernel_spectrum(group_key)
+
+        energy = fft.irfft2(energy_spectrum, s=self.fft_shape)
+        # kernel index 0 is a lag of -(rows - 1), so the in-grid lags start at rows - 1
+        energy = energy[self.num_rows - 1:2 * self.num_rows - 1, self.num_cols - 1:2 * self.num_cols - 1]
+
+        return energy[self.cell_rows, self.cell_cols]
+
+    def _kernel_spectrum(self, group_key: int) -> np.ndarray:
+        spectrum = self._kernel_spectra.get(group_key)
+
+        if spectrum is None:
+            offsets, col_offset = divmod(group_key, SUBCELL_FACTOR)
+            altitude_band, row_offset = divmod(offsets, SUBCELL_FACTOR)
+
+            kernel = self._build_kernel(altitude_band * ALTITUDE_BAND_M, row_offset, col_offset)
+            spectrum = fft.rfft2(kernel, s=self.fft_shape)
+            self._kernel_spectra[group_key] = spectrum
+
+        return spectrum
+
+    def _build_kernel(self, altitude: float, row_offset: int, col_offset: int) -> np.ndarray:
+        # source position inside its cell, relative to the cell centroid
+        source_northing = ((row_offset + 0.5) / SUBCELL_FACTOR - 0.5) * CELL_SIZE
+        source_easting = ((col_offset + 0.5) / SUBCELL_FACTOR - 0.5) * CELL_SIZE
+
+        row_lags = np.arange(-(self.num_rows - 1), self.num_rows) * CELL_SIZE - source_northing
+        col_lags = np.arange(-(self.num_cols - 1), self.num_cols) * CELL_SIZE - source_easting
+
+        squared_distances = row_lags[:, None] ** 2 + col_lags[None, :] ** 2 + altitude ** 2
+
+        return DRONE_SOURCE_ENERGY / squared_distances
+
+
+def _altitude_bands(drone_altitudes: np.ndarray) -> np.ndarray:
+    return np.rint(drone_altitudes / ALTITUDE_BAND_M).astype(np.intp)
+
+
+def _bilinear_splats(subcell_rows, subcell_cols, altitude_bands):
+    first_rows = np.floor(subcell_rows).astype(np.intp)
+    first_cols = np.floor(subcell_cols).astype(np.intp)
+    row_fractions = subcell_rows - first_rows
+    col_fractions = subcell_cols - first_cols
+
+    splat_rows = np.concatenate([first_rows, first_rows, first_rows + 1, first_rows + 1])
+    splat_cols = np.concatenate([first_cols, first_cols + 1, first_cols, first_cols + 1])
+    splat_weights = np.concatenate([
+        (1.0 - row_fractions) * (1.0 - col_fractions),
+        (1.0 - row_fractions) * col_fractions,
+        row_fractions * (1.0 - col_fractions),
+        row_fractions * col_fractions,
+    ])
+
+    return splat_rows, splat_cols, np.tile(altitude_bands, 4), splat_weights
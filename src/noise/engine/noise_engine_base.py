@@ -0,0 +1,19 @@
+import numpy as np
+
+
+class NoiseEngine:
+    def __init__(self, cell_northings: np.ndarray, cell_eastings: np.ndarray):
+        self.cell_northings = cell_northings
+        self.cell_eastings = cell_eastings
+
+    def calculate_energy(
+        self,
+        drone_northings: np.ndarray,
+        drone_eastings: np.ndarray,
+        drone_altitudes: np.ndarray,
+    ) -> np.ndarray:
+        """Linear noise energy at every cell centroid for one tick, summed over all drones."""
+        raise NotImplementedError
+
+    def close(self):
+        """Releases workers or files the engine holds; the engine is not used afterwards."""
@@ -0,0 +1,307 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, fields
+
+import numpy as np
+from numba import njit, prange
+
+from common.file_utils import save_arrays_as_npz
+from noise.noise_math_utils import DRONE_SOURCE_ENERGY, calculate_distance
+
+PENDING_DIR_NAME = "pending"
+CLAIMED_DIR_NAME = "claimed"
+DONE_DIR_NAME = "done"
+
+QUEUE_POLL_INTERVAL_S = 0.05
+QUEUE_RESULT_TIMEOUT_S = 600.0
+# a claim its worker has not refreshed for this long is put back in pending for another worker
+QUEUE_CLAIM_TIMEOUT_S = 300.0
+# a working worker refreshes its claim this many times per claim timeout
+QUEUE_HEARTBEATS_PER_CLAIM_TIMEOUT = 4
+
+
+@dataclass(frozen=True)
+class TileTask:
+    """One tile of one tick: its cell centroids and the weighted sources that can be heard there."""
+    tile_id: int
+    output_start: int
+    cell_northings: np.ndarray
+    cell_eastings: np.ndarray
+    source_northings: np.ndarray
+    source_eastings: np.ndarray
+    source_altitudes: np.ndarray
+    source_weights: np.ndarray
+
+    @property
+    def output_slice(self) -> slice:
+        return slice(self.output_start, self.output_start + len(self.cell_northings))
+
+
+def evaluate_tile_task(task: TileTask) -> np.ndarray:
+    return _calculate_weighted_cells_energy(
+        task.cell_northings,
+        task.cell_eastings,
+        task.source_northings,
+        task.source_eastings,
+        task.source_altitudes,
+        task.source_weights,
+    )
+
+
+@njit(parallel=True, nogil=True, error_model="numpy")
+def _calculate_weighted_cells_energy(
+    cell_northings,
+    cell_eastings,
+    source_northings,
+    source_eastings,
+    source_altitudes,
+    source_weights,
+):
+    num_cells = len(cell_northings)
+    total_energy_result = np.zeros(num_cells, dtype=np.float64)
+
+    for i in prange(num_cells):
+        energy = 0.0
+        for j in range(len(source_northings)):
+            squared_distance = calculate_distance(
+                cell_northings[i] - source_northings[j],
+                cell_eastings[i] - source_eastings[j],
+                source_altitudes[j],
+            )
+            energy += source_weights[j] * DRONE_SOURCE_ENERGY / squared_distance
+
+        total_energy_result[i] = energy
+
+    return total_energy_result
+
+
+class TileRunner:
+    def run(self, tasks: list[TileTask], output: np.ndarray):
+        """Evaluates every task and writes its energies into output[task.output_slice]."""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class LocalTileRunner(TileRunner):
+    """In-process stand-in for the distributed runners, evaluating the tiles one after another."""
+
+    def run(self, tasks: list[TileTask], output: np.ndarray):
+        for task in tasks:
+            output[task.output_slice] = evaluate_tile_task(task)
+
+
+class ProcessTileRunner(TileRunner):
+    """
+    Tiles are evaluated by a pool of local worker processes, which write straight into a memory-mapped
+    output grid, so only the culled tile inputs are pickled.
+    """
+
+    def __init__(self, max_workers: int | None = None):
+        self.max_workers = max_workers
+        self._executor: ProcessPoolExecutor | None = None
+        self._output_path: str | None = None
+        self._shared_output: np.memmap | None = None
+
+    def run(self, tasks: list[TileTask], output: np.ndarray):
+        if self._executor is None:
+            output_file, self._output_path = tempfile.mkstemp(suffix=".energy")
+            os.close(output_file)
+            # every tick writes all tiles, so the grid is mapped once and simply overwritten
+            self._shared_output = np.memmap(self._output_path, dtype=np.float64, mode="w+", shape=output.shape)
+
+            # forking a process that already runs numba's TBB pool leaves the parent unable to exit
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_memmap_worker,
+                initargs=(self._output_path, output.shape),
+            )
+
+        list(self._executor.map(_evaluate_tile_into_memmap, tasks))
+        output[:] = self._shared_output
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._shared_output = None
+            os.remove(self._output_path)
+            self._executor = None
+
+
+_WORKER_OUTPUT: np.memmap | None = None
+
+
+def _init_memmap_worker(output_path: str, output_shape: tuple[int, ...]):
+    global _WORKER_OUTPUT
+    _WORKER_OUTPUT = np.memmap(output_path, dtype=np.float64, mode="r+", shape=output_shape)
+
+
+def _evaluate_tile_into_memmap(task: TileTask):
+    # the mapping is shared with the parent, which sees the write without a flush to disk
+    _WORKER_OUTPUT[task.output_slice] = evaluate_tile_task(task)
+
+
+class FileQueueTileRunner(TileRunner):
+    """
+    Publishes tile tasks as files in queue_directory and collects the results written by run_tile_worker,
+    which can run in any number of processes or on any host that shares the directory.
+    """
+
+    def __init__(self, queue_directory: str, result_timeout_s: float = QUEUE_RESULT_TIMEOUT_S):
+        self.queue_directory = queue_directory
+        self.result_timeout_s = result_timeout_s
+        # unique across hosts sharing the directory, unlike a process id
+        self._run_id = uuid.uuid4().hex
+        self._batch = 0
+
+        for dir_name in (PENDING_DIR_NAME, CLAIMED_DIR_NAME, DONE_DIR_NAME):
+            os.makedirs(os.path.join(queue_directory, dir_name), exist_ok=True)
+
+    def run(self, tasks: list[TileTask], output: np.ndarray):
+        self._batch += 1
+        waiting = {}
+
+        for task in tasks:
+            task_name = f"{self._run_id}_{self._batch}_{task.tile_id}.npz"
+            save_arrays_as_npz(os.path.join(self.queue_directory, PENDING_DIR_NAME, task_name), **_task_arrays(task))
+            waiting[task_name] = task
+
+        deadline = time.monotonic() + self.result_timeout_s
+        while waiting:
+            for task_name in list(waiting):
+                result_path = os.path.join(self.queue_directory, DONE_DIR_NAME, task_name)
+                if os.path.exists(result_path):
+                    with np.load(result_path) as result:
+                        output[waiting.pop(task_name).output_slice] = result["energy"]
+                    os.remove(result_path)
+
+            if waiting:
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"{len(waiting)} tile tasks in '{self.queue_directory}' got no result")
+                time.sleep(QUEUE_POLL_INTERVAL_S)
+
+    def close(self):
+        # tasks left over by a failed run, and duplicate results of tasks that were requeued after a slow claim
+        for dir_name in (PENDING_DIR_NAME, DONE_DIR_NAME):
+            queue_dir = os.path.join(self.queue_directory, dir_name)
+            for file_name in os.listdir(queue_dir):
+                if file_name.startswith(f"{self._run_id}_"):
+                    _remove_if_exists(os.path.join(queue_dir, file_name))
+
+
+def run_tile_worker(
+    queue_directory: str,
+    idle_timeout_s: float | None = None,
+    claim_timeout_s: float = QUEUE_CLAIM_TIMEOUT_S,
+):
+    """
+    Claims and evaluates tasks published by FileQueueTileRunner until idle for idle_timeout_s. A claim is
+    the task file renamed to <task>.<worker id> and refreshed while the task runs, so claims left unrefreshed
+    for claim_timeout_s, e.g. by a worker that died mid-task, are put back in pending.
+    """
+    pending_dir = os.path.join(queue_directory, PENDING_DIR_NAME)
+    claimed_dir = os.path.join(queue_directory, CLAIMED_DIR_NAME)
+    done_dir = os.path.join(queue_directory, DONE_DIR_NAME)
+
+    worker_id = uuid.uuid4().hex
+    heartbeat_interval_s = claim_timeout_s / QUEUE_HEARTBEATS_PER_CLAIM_TIMEOUT
+
+    last_task_time = time.monotonic()
+    while idle_timeout_s is None or time.monotonic() - last_task_time < idle_timeout_s:
+        _requeue_stale_claims(pending_dir, claimed_dir, claim_timeout_s)
+
+        task_names = sorted(name for name in os.listdir(pending_dir) if name.endswith(".npz"))
+        if not task_names:
+            time.sleep(QUEUE_POLL_INTERVAL_S)
+            continue
+
+        for task_name in task_names:
+            claimed_path = os.path.join(claimed_dir, f"{task_name}.{worker_id}")
+            # the rename is atomic, so exactly one worker wins each task
+            try:
+                os.rename(os.path.join(pending_dir, task_name), claimed_path)
+                # a rename keeps the publish time, the claim age is measured from here
+                os.utime(claimed_path)
+                with np.load(claimed_path) as arrays:
+                    task = _task_from_arrays(arrays)
+            except FileNotFoundError:
+                continue
+
+            with _refreshed_claim(claimed_path, heartbeat_interval_s):
+                energy = evaluate_tile_task(task)
+
+            save_arrays_as_npz(os.path.join(done_dir, task_name), energy=energy)
+            # only this worker's own claim, a requeued copy claimed by another worker stays untouched
+            _remove_if_exists(claimed_path)
+            last_task_time = time.monotonic()
+
+
+@contextmanager
+def _refreshed_claim(claimed_path: str, interval_s: float):
+    stopped = threading.Event()
+
+    def refresh():
+        while not stopped.wait(interval_s):
+            try:
+                os.utime(claimed_path)
+            except FileNotFoundError:
+                return
+
+    # the tile kernel releases the GIL, so the claim keeps being refreshed however long a task runs
+    heartbeat = threading.Thread(target=refresh, name="tile-claim-heartbeat", daemon=True)
+    heartbeat.start()
+    try:
+        yield
+    finally:
+        stopped.set()
+        heartbeat.join()
+
+
+def _requeue_stale_claims(pending_dir: str, claimed_dir: str, claim_timeout_s: float):
+    now = time.time()
+    for claim_name in os.listdir(claimed_dir):
+        claimed_path = os.path.join(claimed_dir, claim_name)
+        task_name, _ = os.path.splitext(claim_name)
+        try:
+            if now - os.path.getmtime(claimed_path) > claim_timeout_s:
+                os.rename(claimed_path, os.path.join(pending_dir, task_name))
+        except FileNotFoundError:
+            continue
+
+
+def _remove_if_exists(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _task_arrays(task: TileTask) -> dict[str, np.ndarray]:
+    return {task_field.name: np.asarray(getattr(task, task_field.name)) for task_field in fields(TileTask)}
+
+
+def _task_from_arrays(arrays) -> TileTask:
+    return TileTask(
+        tile_id=int(arrays["tile_id"]),
+        output_start=int(arrays["output_start"]),
+        **{
+            task_field.name: arrays[task_field.name]
+            for task_field in fields(TileTask)
+            if task_field.name not in ("tile_id", "output_start")
+        },
+    )
+
+
+if __name__ == "__main__":
+    run_tile_worker(sys.argv[1])
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import numpy as np
+
+from common.model_configs import model_config
+from noise.engine.noise_engine_base import NoiseEngine
+from noise.engine.tile_workers import ProcessTileRunner, TileRunner, TileTask
+
+CELL_SIZE = model_config.grid.noise_cell_m
+BOUNDARIES = model_config.map_boundaries
+
+TILE_CELLS = 64
+# drones within the halo of a tile are sent individually, farther ones as one source per far-field bin
+HALO_M = 5_000.0
+FAR_FIELD_BIN_M = HALO_M / 8
+
+
+class TiledNoiseEngine(NoiseEngine):
+    """
+    Spatial decomposition of the cell grid into TILE_CELLS x TILE_CELLS tiles, evaluated independently by a
+    TileRunner. Each tile receives only its own centroids and a culled source list: the drones within
+    HALO_M of the tile, and the remaining drones merged per FAR_FIELD_BIN_M bin into one source at their
+    mean position and mean squared altitude. A halo of None sends every drone and reproduces the exact
+    engine.
+    """
+
+    def __init__(
+        self,
+        cell_northings: np.ndarray,
+        cell_eastings: np.ndarray,
+        runner: TileRunner | None = None,
+        tile_cells: int = TILE_CELLS,
+        halo_m: float | None = HALO_M,
+        far_field_bin_m: float = FAR_FIELD_BIN_M,
+    ):
+        super().__init__(cell_northings, cell_eastings)
+        self.runner = runner if runner is not None else ProcessTileRunner()
+        self.halo_m = halo_m
+        self.far_field_bin_m = far_field_bin_m
+
+        tile_rows = np.floor((cell_northings - BOUNDARIES.bottom) / (CELL_SIZE * tile_cells)).astype(np.int64)
+        tile_cols = np.floor((cell_eastings - BOUNDARIES.left) / (CELL_SIZE * tile_cells)).astype(np.int64)
+        cell_tiles = tile_rows * (tile_cols.max() + 1) + tile_cols
+
+        # cells are stored tile by tile, so every tile writes one contiguous slice of the output grid
+        self.tile_order = np.argsort(cell_tiles, kind="stable")
+        tile_ids, self.tile_starts = np.unique(cell_tiles[self.tile_order], return_index=True)
+        self.tile_ends = np.append(self.tile_starts[1:], len(cell_tiles))
+        self.tile_ids = tile_ids.tolist()
+
+        self.ordered_northings = np.ascontiguousarray(cell_northings[self.tile_order])
+        self.ordered_eastings = np.ascontiguousarray(cell_eastings[self.tile_order])
+        self.tile_bounds = [
+            (
+                self.ordered_northings[start:end].min(),
+                self.ordered_northings[start:end].max(),
+                self.ordered_eastings[start:end].min(),
+                self.ordered_eastings[start:end].max(),
+            )
+            for start, end in zip(self.tile_starts.tolist(), self.tile_ends.tolist())
+        ]
+
+    def calculate_energy(self, drone_northings, drone_eastings, drone_altitudes):
+        tasks = [
+            self._build_tile_task(tile_id, start, end, bounds, drone_northings, drone_eastings, drone_altitudes)
+            for tile_id, start, end, bounds in zip(self.tile_ids, self.tile_starts.tolist(), self.tile_ends.tolist(), self.tile_bounds)
+        ]
+
+        ordered_energy = np.empty(len(self.cell_northings), dtype=np.float64)
+        self.runner.run(tasks, ordered_energy)
+
+        total_energy = np.empty_like(ordered_energy)
+        total_energy[self.tile_order] = ordered_energy
+        return total_energy
+
+    def close(self):
+        self.runner.close()
+
+    def _build_tile_task(self, tile_id, start, end, bounds, drone_northings, drone_eastings, drone_altitudes) -> TileTask:
+        if self.halo_m is None:
+            near = np.ones(len(drone_northings), dtype=bool)
+        else:
+            min_northing, max_northing, min_easting, max_easting = bounds
+            northing_gaps = np.maximum(np.maximum(min_northing - drone_northings, drone_northings - max_northing), 0.0)
+            easting_gaps = np.maximum(np.maximum(min_easting - drone_eastings, drone_eastings - max_easting), 0.0)
+            near = northing_gaps ** 2 + easting_gaps ** 2 <= self.halo_m ** 2
+
+        far_sources = self._merge_far_field(drone_northings[~near], drone_eastings[~near], drone_altitudes[~near])
+
+        return TileTask(
+            tile_id=tile_id,
+            output_start=start,
+            cell_northings=self.ordered_northings[start:end],
+            cell_eastings=self.ordered_eastings[start:end],
+            source_northings=np.concatenate([drone_northings[near], far_sources[0]]),
+            source_eastings=np.concatenate([drone_eastings[near], far_sources[1]]),
+            source_altitudes=np.concatenate([drone_altitudes[near], far_sources[2]]),
+            source_weights=np.concatenate([np.ones(near.sum()), far_sources[3]]),
+        )
+
+    def _merge_far_field(self, drone_northings, drone_eastings, drone_altitudes):
+        bin_rows = np.floor((drone_northings - BOUNDARIES.bottom) / self.far_field_bin_m).astype(np.int64)
+        bin_cols = np.floor((drone_eastings - BOUNDARIES.left) / self.far_field_bin_m).astype(np.int64)
+        bin_keys, bin_indices = np.unique(bin_rows * (1 << 32) + bin_cols, return_inverse=True)
+
+        counts = np.bincount(bin_indices, minlength=len(bin_keys)).astype(np.float64)
+        # every source has the same power, so a merged bin sits at the plain mean position
+        return (
+            np.bincount(bin_indices, weights=drone_northings, minlength=len(bin_keys)) / counts,
+            np.bincount(bin_indices, weights=drone_eastings, minlength=len(bin_keys)) / counts,
+            np.sqrt(np.bincount(bin_indices, weights=drone_altitudes ** 2, minlength=len(bin_keys)) / counts),
+            counts,
+        )
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import numpy as np
+from numba import njit, prange
+
+from noise.engine.noise_engine_base import NoiseEngine
+from noise.noise_math_utils import DRONE_SOURCE_ENERGY, calculate_distance, calculate_energy_at_distance
+
+# a cluster is treated as one source once its size is below OPENING_ANGLE times its distance to the cell
+OPENING_ANGLE = 0.5
+LEAF_CAPACITY = 8
+MAX_TREE_DEPTH = 12
+
+
+class TreeNoiseEngine(NoiseEngine):
+    """
+    Barnes-Hut style engine: drones are clustered into a quadtree every tick, distant clusters contribute
+    their summed energy from their centroid, near ones are opened down to the leaves and evaluated exactly.
+    An opening angle of 0 opens every cluster and reproduces the exact engine.
+    """
+
+    def __init__(self, cell_northings: np.ndarray, cell_eastings: np.ndarray, opening_angle: float = OPENING_ANGLE):
+        super().__init__(cell_northings, cell_eastings)
+        self.opening_angle = opening_angle
+
+    def calculate_energy(self, drone_northings, drone_eastings, drone_altitudes):
+        if len(drone_northings) == 0:
+            return np.zeros(len(self.cell_northings), dtype=np.float64)
+
+        tree = _build_drone_quadtree(drone_northings, drone_eastings, drone_altitudes)
+
+        return _evaluate_drone_quadtree(
+            self.cell_northings,
+            self.cell_eastings,
+            *tree,
+            self.opening_angle,
+        )
+
+
+def _build_drone_quadtree(drone_northings, drone_eastings, drone_altitudes):
+    num_drones = len(drone_northings)
+    depth = min(MAX_TREE_DEPTH, max(0, int(np.ceil(np.log(num_drones / LEAF_CAPACITY) / np.log(4.0)))))
+
+    # square root node around every drone, slightly enlarged so the far edge still falls inside the last leaf
+    origin_northing, origin_easting = drone_northings.min(), drone_eastings.min()
+    root_size = max(np.ptp(drone_northings), np.ptp(drone_eastings), 1.0) * (1.0 + 1e-9)
+
+    leaves_per_side = 2 ** depth
+    leaf_rows = np.minimum(((drone_northings - origin_northing) / root_size * leaves_per_side).astype(np.int64), leaves_per_side - 1)
+    leaf_cols = np.minimum(((drone_eastings - origin_easting) / root_size * leaves_per_side).astype(np.int64), leaves_per_side - 1)
+
+    level_offsets = np.zeros(depth + 2, dtype=np.int64)
+    level_offsets[1:] = np.cumsum(4 ** np.arange(depth + 1))
+    num_nodes = int(level_offsets[-1])
+
+    node_counts = np.zeros(num_nodes, dtype=np.float64)
+    node_northing_sums = np.zeros(num_nodes, dtype=np.float64)
+    node_easting_sums = np.zeros(num_nodes, dtype=np.float64)
+    node_altitude_square_sums = np.zeros(num_nodes, dtype=np.float64)
+
+    for level in range(depth + 1):
+        nodes_per_side = 2 ** level
+        shift = depth - level
+        local_indices = (leaf_rows >> shift) * nodes_per_side + (leaf_cols >> shift)
+        level_slice = slice(level_offsets[level], level_offsets[level + 1])
+
+        node_counts[level_slice] = np.bincount(local_indices, minlength=nodes_per_side ** 2)
+        node_northing_sums[level_slice] = np.bincount(local_indices, weights=drone_northings, minlength=nodes_per_side ** 2)
+        node_easting_sums[level_slice] = np.bincount(local_indices, weights=drone_eastings, minlength=nodes_per_side ** 2)
+        node_altitude_square_sums[level_slice] = np.bincount(
+            local_indices, weights=drone_altitudes ** 2, minlength=nodes_per_side ** 2
+        )
+
+    # every source has the same power, so the energy centroid is the plain mean position
+    occupied = node_counts > 0
+    node_northings = np.divide(node_northing_sums, node_counts, out=np.zeros(num_nodes), where=occupied)
+    node_eastings = np.divide(node_easting_sums, node_counts, out=np.zeros(num_nodes), where=occupied)
+    node_altitude_squares = np.divide(node_altitude_square_sums, node_counts, out=np.zeros(num_nodes), where=occupied)
+
+    leaf_indices = leaf_rows * leaves_per_side + leaf_cols
+    drone_order = np.argsort(leaf_indices, kind="stable")
+    leaf_starts = np.searchsorted(leaf_indices[drone_order], np.arange(leaves_per_side ** 2 + 1))
+
+    return (
+        depth,
+        root_size,
+        level_offsets,
+        node_counts,
+        node_northings,
+        node_eastings,
+        node_altitude_squares,
+        leaf_starts,
+        drone_northings[drone_order],
+        drone_eastings[drone_order],
+        drone_altitudes[drone_order],
+    )
+
+
+@njit(parallel=True, nogil=True, error_model="numpy")
+def _evaluate_drone_quadtree(
+    cell_northings,
+    cell_eastings,
+    depth,
+    root_size,
+    level_offsets,
+    node_counts,
+    node_northings,
+    node_eastings,
+    node_altitude_squares,
+    leaf_starts,
+    drone_northings,
+    drone_eastings,
+    drone_altitudes,
+    opening_angle,
+):
+    num_cells = len(cell_northings)
+    total_energy_result = np.zeros(num_cells, dtype=np.float64)
+    squared_opening_angle = opening_angle ** 2
+
+    for i in prange(num_cells):
+        centroid_northing = cell_northings[i]
+        centroid_easting = cell_eastings[i]
+
+        # depth-first walk, at most three siblings per level wait on the stack
+        stack_levels = np.empty(3 * depth + 1, dtype=np.int64)
+        stack_nodes = np.empty(3 * depth + 1, dtype=np.int64)
+        stack_levels[0] = 0
+        stack_nodes[0] = 0
+        stack_size = 1
+
+        energy = 0.0
+        while stack_size > 0:
+            stack_size -= 1
+            level = stack_levels[stack_size]
+            local_index = stack_nodes[stack_size]
+            node = level_offsets[level] + local_index
+
+            node_size = root_size / (2 ** level)
+            squared_distance = calculate_distance(
+                centroid_northing - node_northings[node],
+                centroid_easting - node_eastings[node],
+                0.0,
+            ) + node_altitude_squares[node]
+
+            if node_size * node_size < squared_opening_angle * squared_distance:
+                energy += node_counts[node] * DRONE_SOURCE_ENERGY / squared_distance
+                continue
+
+            if level == depth:
+                for j in range(leaf_starts[local_index], leaf_starts[local_index + 1]):
+                    energy += calculate_energy_at_distance(calculate_distance(
+                        centroid_northing - drone_northings[j],
+                        centroid_easting - drone_eastings[j],
+                        drone_altitudes[j],
+                    ))
+                continue
+
+            nodes_per_side = 2 ** level
+            row, col = local_index // nodes_per_side, local_index % nodes_per_side
+            child_offset = level_offsets[level + 1]
+            for child_row in range(2 * row, 2 * row + 2):
+                for child_col in range(2 * col, 2 * col + 2):
+                    child_index = child_row * (2 * nodes_per_side) + child_col
+                    if node_counts[child_offset + child_index] > 0:
+                        stack_levels[stack_size] = level + 1
+                        stack_nodes[stack_size] = child_index
+                        stack_size += 1
+
+        total_energy_result[i] = energy
+
+    return total_energy_result
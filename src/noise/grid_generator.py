@@ -1,8 +1,8 @@
 import math
 from dataclasses import dataclass, field
 
-import geopandas as gpd
-from shapely.geometry import box
+import numpy as np
+import shapely
 
 from common.coordinate import Coordinate
 from common.model_configs import model_config
@@ -27,6 +27,8 @@ class Cell:
 
 
 def load_and_reproject_geojson(file_path):
+    import geopandas as gpd
+
     df = gpd.read_file(file_path)
     return df.to_crs(epsg=27700)
 
@@ -39,25 +41,34 @@ def compute_grid_dimensions():
 
 
 def create_grid():
-    cells = []
     num_rows, num_cols = compute_grid_dimensions()
+    rows, cols = np.divmod(np.arange(num_rows * num_cols), num_cols)
+    geometries = build_cell_geometries(rows, cols)
+
+    return [
+        {
+            "geometry": geometry,
+            "row": r,
+            "col": c
+        }
+        for geometry, r, c in zip(geometries, rows.tolist(), cols.tolist())
+    ]
 
-    for r in range(num_rows):
-        y = BOUNDARIES.bottom + r * CELL_SIZE
-        for c in range(num_cols):
-            x = BOUNDARIES.left + c * CELL_SIZE
-            geometry = box(x, y, x + CELL_SIZE, y + CELL_SIZE)
-            cells.append({
-                "geometry": geometry,
-                "row": r,
-                "col": c
-            })
 
-    return cells
+def build_cell_geometries(rows, cols):
+    x = BOUNDARIES.left + np.asarray(cols) * CELL_SIZE
+    y = BOUNDARIES.bottom + np.asarray(rows) * CELL_SIZE
+    return shapely.box(x, y, x + CELL_SIZE, y + CELL_SIZE)
 
 
 def filter_cells_in_polygon(cells, boundary_polygon):
-    return [cell for cell in cells if cell["geometry"].intersects(boundary_polygon)]
+    geometries = np.array([cell["geometry"] for cell in cells], dtype=object)
+
+    # the prepared boundary must be the first argument for GEOS to use its index
+    shapely.prepare(boundary_polygon)
+    inside = shapely.intersects(boundary_polygon, geometries)
+
+    return [cell for cell, is_inside in zip(cells, inside.tolist()) if is_inside]
 
 
 def get_valid_cells():
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from common.enum import NavigationType
-from noise.navigator.cached_routes_navigator import CachedRoutesNavigator
-from noise.navigator.cost_function_generator import WeightSpec, make_mixed_distance_noise_weight
-from noise.navigator.navigator_base import BaseNavigator
-from noise.navigator.warehouse_route_cache_generator import WarehouseRouteCacheGenerator
+
+if TYPE_CHECKING:
+    from noise.navigator.cost_function_generator import WeightSpec
+    from noise.navigator.navigator_base import BaseNavigator
 
 _NAV_CACHE: dict[tuple, BaseNavigator] = {}
 
+_MIXED_DIST_KEY = "distance"
+_MIXED_NOISE_KEY = "noise"
+_MIXED_HIGHER_NOISE_IS_BETTER = False
+
 
 def clear_navigator_cache():
     _NAV_CACHE.clear()
@@ -38,6 +44,14 @@ def _default_mixed_weight_id(alpha: float, dist_key: str, noise_key: str, higher
     return f"mixed__a={alpha:.2f}__dist={dist_key}__noise={noise_key}__hnib={int(higher_noise_is_better)}"
 
 
+def get_navigator_weight_id(mode: NavigationType, weight_id: str | None = None) -> str | None:
+    if weight_id is None and _is_mixed_mode(mode):
+        return _default_mixed_weight_id(
+            _mixed_alpha_for_mode(mode), _MIXED_DIST_KEY, _MIXED_NOISE_KEY, _MIXED_HIGHER_NOISE_IS_BETTER
+        )
+    return weight_id
+
+
 def _cache_get(key: tuple) -> BaseNavigator | None:
     return _NAV_CACHE.get(key)
 
@@ -54,15 +68,19 @@ def get_navigator(
     weight_id: str | None = None,
     compute_on_miss: bool = False,
 ) -> BaseNavigator:
+    # the navigators pull in networkx, scipy and the navigation graph, so they load on first request only
+    from noise.navigator.cached_routes_navigator import CachedRoutesNavigator
+    from noise.navigator.cost_function_generator import make_mixed_distance_noise_weight
+    from noise.navigator.warehouse_route_cache_generator import WarehouseRouteCacheGenerator
+
     if _is_mixed_mode(mode):
         alpha = _mixed_alpha_for_mode(mode)
 
-        dist_key = "distance"
-        noise_key = "noise"
-        higher_noise_is_better = False
+        dist_key = _MIXED_DIST_KEY
+        noise_key = _MIXED_NOISE_KEY
+        higher_noise_is_better = _MIXED_HIGHER_NOISE_IS_BETTER
 
-        if weight_id is None:
-            weight_id = _default_mixed_weight_id(alpha, dist_key, noise_key, higher_noise_is_better)
+        weight_id = get_navigator_weight_id(mode, weight_id)
 
         key = ("mixed", mode.name, weight_id)
         cached = _cache_get(key)
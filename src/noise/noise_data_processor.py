@@ -1,65 +1,148 @@
 import json
+from functools import lru_cache
 
 import numpy as np
 import pandas as pd
 
-from common.path_configs import BASE_NOISE_PATH
-from noise.noise_math_utils import add_two_decibel_levels, calculate_leq
+from common.file_utils import is_cache_fresh, save_arrays_as_npz
+from common.path_configs import BASE_NOISE_PATH, get_base_noise_levels_cache_file
+from noise.cell_noise_statistics import CellNoiseStatistics
+from noise.noise_math_utils import add_decibel_levels
+
+CELL_INDEX_DTYPE = np.int32
+NOISE_LEVEL_DTYPE = np.float64
+
+# row and column share one int64 key, so aligning two cell sets is a single sorted search
+CELL_KEY_COLUMN_BITS = 32
 
 
 def read_base_noise_data(file_path: str = BASE_NOISE_PATH) -> pd.DataFrame:
+    base_noise_df = load_base_noise_levels(file_path).copy()
+    base_noise_df['geometry'] = load_base_noise_geometry(file_path)['geometry'].to_numpy()
+
+    return base_noise_df
+
+
+@lru_cache(maxsize=None)
+def load_base_noise_levels(file_path: str = BASE_NOISE_PATH) -> pd.DataFrame:
+    cache_path = get_base_noise_levels_cache_file(file_path)
+
+    if is_cache_fresh(cache_path, file_path):
+        with np.load(cache_path) as cached:
+            rows, cols, noise_levels = cached['row'], cached['col'], cached['noise_level']
+    else:
+        rows, cols, noise_levels = _parse_base_noise_levels(file_path)
+        _save_base_noise_levels_cache(cache_path, rows, cols, noise_levels)
+
+    return pd.DataFrame({'row': rows, 'col': cols, 'noise_level': noise_levels})
+
+
+@lru_cache(maxsize=None)
+def load_base_noise_geometry(file_path: str = BASE_NOISE_PATH) -> pd.DataFrame:
+    features = _read_base_noise_features(file_path)
+
+    # same feature order as the cached levels, so both frames line up row for row
+    return pd.DataFrame({
+        'row': np.array([feature.get('properties', {}).get('row', 0) for feature in features], dtype=CELL_INDEX_DTYPE),
+        'col': np.array([feature.get('properties', {}).get('col', 0) for feature in features], dtype=CELL_INDEX_DTYPE),
+        'geometry': [feature.get('geometry', {}) for feature in features],
+    })
+
+
+def with_base_noise_geometry(noise_df: pd.DataFrame, file_path: str = BASE_NOISE_PATH) -> pd.DataFrame:
+    if 'geometry' in noise_df.columns:
+        return noise_df
+
+    return pd.merge(noise_df, load_base_noise_geometry(file_path), on=['row', 'col'], how='left')
+
+
+def _read_base_noise_features(file_path: str) -> list:
     with open(file_path, 'r') as f:
-        data = json.load(f)
+        return json.load(f).get('features', [])
+
 
-    records = []
-    for feature in data.get('features', []):
-        props = feature.get('properties', {})
-        geometry = feature.get('geometry', {})
-        records.append({
-            'row': props.get('row', 0),
-            'col': props.get('col', 0),
-            'noise_level': props.get('noise_level', 0.0),
-            'geometry': geometry
-        })
+def _parse_base_noise_levels(file_path: str) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    properties = [feature.get('properties', {}) for feature in _read_base_noise_features(file_path)]
 
-    return pd.DataFrame(records)
+    rows = np.array([props.get('row', 0) for props in properties], dtype=CELL_INDEX_DTYPE)
+    cols = np.array([props.get('col', 0) for props in properties], dtype=CELL_INDEX_DTYPE)
+    noise_levels = np.array([props.get('noise_level', 0.0) for props in properties], dtype=NOISE_LEVEL_DTYPE)
 
-BASE_NOISE_DATA = read_base_noise_data()
+    return rows, cols, noise_levels
 
-def generate_drone_noise_df(drone_noise_data) -> pd.DataFrame:
-    records = [
-        {
-            "row": cell.row,
-            "col": cell.column,
-            "average_noise": calculate_leq(np.array(cell.noise_history)),
-            "maximum_noise": cell.max_noise,
-        }
-        for cell in drone_noise_data
-    ]
 
-    return pd.DataFrame(records).set_index(['row', 'col'])
+def _save_base_noise_levels_cache(cache_path: str, rows: np.ndarray, cols: np.ndarray, noise_levels: np.ndarray):
+    try:
+        save_arrays_as_npz(cache_path, row=rows, col=cols, noise_level=noise_levels)
+    except OSError as e:
+        print(f"Error saving base noise cache to '{cache_path}': {e}")
+
+
+def generate_drone_noise_df(noise_cells, statistics: CellNoiseStatistics) -> pd.DataFrame:
+    return pd.DataFrame({
+        "row": np.array([cell.row for cell in noise_cells], dtype=CELL_INDEX_DTYPE),
+        "col": np.array([cell.column for cell in noise_cells], dtype=CELL_INDEX_DTYPE),
+        "average_noise": statistics.average_levels.astype(NOISE_LEVEL_DTYPE),
+        "maximum_noise": statistics.maximum_levels.astype(NOISE_LEVEL_DTYPE),
+        **statistics.summary_columns(),
+        **statistics.window_columns(),
+    })
 
 
 def combine_noise_levels(drone_noise_df: pd.DataFrame, base_noise_df: pd.DataFrame) -> pd.DataFrame:
-    merged_df = pd.merge(
-        drone_noise_df,
-        base_noise_df,
-        on=['row', 'col'],
-        how='inner',
-        suffixes=('_drone', '_base')
-    )
+    drone_noise_df = _with_cell_columns(drone_noise_df)
+    drone_positions, base_positions = _match_cells(drone_noise_df, base_noise_df)
+
+    combined_df = pd.DataFrame({
+        "row": drone_noise_df["row"].to_numpy(dtype=CELL_INDEX_DTYPE)[drone_positions],
+        "col": drone_noise_df["col"].to_numpy(dtype=CELL_INDEX_DTYPE)[drone_positions],
+    })
+
+    for column in drone_noise_df.columns.drop(["row", "col"]):
+        combined_df[column] = drone_noise_df[column].to_numpy()[drone_positions]
+
+    for column in base_noise_df.columns.drop(["row", "col"]):
+        combined_df[column] = base_noise_df[column].to_numpy()[base_positions]
+
+    average_noise = combined_df["average_noise"].to_numpy(dtype=NOISE_LEVEL_DTYPE)
+    base_noise = combined_df["noise_level"].to_numpy(dtype=NOISE_LEVEL_DTYPE)
+    combined_noise = add_decibel_levels(average_noise, base_noise)
+
+    combined_df["combined_noise"] = combined_noise
+    combined_df["noise_difference"] = combined_noise - base_noise
+
+    return combined_df
+
+
+def combine_base_and_drone_noise(noise_cells, statistics: CellNoiseStatistics) -> pd.DataFrame:
+    drone_noise_df = generate_drone_noise_df(noise_cells, statistics)
+
+    return combine_noise_levels(drone_noise_df, load_base_noise_levels())
+
+
+def _with_cell_columns(noise_df: pd.DataFrame) -> pd.DataFrame:
+    if "row" in noise_df.columns and "col" in noise_df.columns:
+        return noise_df
+
+    return noise_df.reset_index()
+
+
+def _match_cells(drone_noise_df: pd.DataFrame, base_noise_df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    drone_keys = _cell_keys(drone_noise_df["row"].to_numpy(), drone_noise_df["col"].to_numpy())
+    base_keys = _cell_keys(base_noise_df["row"].to_numpy(), base_noise_df["col"].to_numpy())
 
-    merged_df['combined_noise'] = merged_df.apply(
-        lambda x: add_two_decibel_levels(x['average_noise'], x['noise_level']),
-        axis=1
-    )
+    base_order = np.argsort(base_keys, kind="stable")
+    sorted_base_keys = base_keys[base_order]
 
-    merged_df['noise_difference'] = merged_df['combined_noise'] - merged_df['noise_level']
+    if len(sorted_base_keys) == 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
 
-    return merged_df
+    candidates = np.minimum(np.searchsorted(sorted_base_keys, drone_keys), len(sorted_base_keys) - 1)
+    matched = sorted_base_keys[candidates] == drone_keys
 
+    # inner join in drone-cell order, like pd.merge(how='inner') with the drone frame on the left
+    return np.flatnonzero(matched), base_order[candidates[matched]]
 
-def combine_base_and_drone_noise(drone_noise_data) -> pd.DataFrame:
-    drone_noise_df = generate_drone_noise_df(drone_noise_data)
 
-    return combine_noise_levels(drone_noise_df, BASE_NOISE_DATA)
+def _cell_keys(rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    return (rows.astype(np.int64) << CELL_KEY_COLUMN_BITS) | cols.astype(np.int64)
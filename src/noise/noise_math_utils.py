@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 import numpy as np
 from numba import njit
 
@@ -10,6 +12,8 @@ DRONE_ALTITUDE_SQUARED = DRONE_FLIGHT_ALTITUDE ** 2
 BASELINE_NOISE_AT_ALTITUDE = DRONE_NOISE_AT_SOURCE - 20.0 * np.log10(DRONE_FLIGHT_ALTITUDE)
 MATH_LOG_10_DIVIDED_BY_10 = np.log(10.0) / 10.0
 ZERO_NOISE_SQUARED_DISTANCE = (10.0 ** (0.1 * DRONE_NOISE_AT_SOURCE)) - DRONE_ALTITUDE_SQUARED
+# sound energy relative to the reference level, at unit squared distance from the drone
+DRONE_SOURCE_ENERGY = 10.0 ** (0.1 * DRONE_NOISE_AT_SOURCE)
 
 
 @njit
@@ -22,6 +26,11 @@ def calculate_noise_at_distance(squared_distance: float) -> float:
     return DRONE_NOISE_AT_SOURCE - 10.0 * np.log10(squared_distance)
 
 
+@njit(error_model="numpy")
+def calculate_energy_at_distance(squared_distance: float) -> float:
+    return DRONE_SOURCE_ENERGY / squared_distance
+
+
 @njit
 def calculate_mixed_noise_level(sound_sources):
     if len(sound_sources) == 0:
@@ -39,5 +48,11 @@ def add_two_decibel_levels(first_dbl_level: float, second_dbl_level: float) -> f
     return 10.0 * np.log10((10.0 ** (first_dbl_level / 10.0)) + (10.0 ** (second_dbl_level / 10.0)))
 
 
-def calculate_leq(noise_levels_db: np.ndarray) -> float:
-    return 10.0 * np.log10(np.mean(10.0 ** (noise_levels_db / 10.0)))
+def add_decibel_levels(first_dbl_levels: np.ndarray, second_dbl_levels: np.ndarray) -> np.ndarray:
+    first_log_energy = np.multiply(first_dbl_levels, MATH_LOG_10_DIVIDED_BY_10)
+    second_log_energy = np.multiply(second_dbl_levels, MATH_LOG_10_DIVIDED_BY_10)
+    return np.logaddexp(first_log_energy, second_log_energy) / MATH_LOG_10_DIVIDED_BY_10
+
+
+def calculate_leq(noise_levels_db: np.ndarray, axis: int | None = None) -> float | np.ndarray:
+    return 10.0 * np.log10(np.mean(10.0 ** (noise_levels_db / 10.0), axis=axis))
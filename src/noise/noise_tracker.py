@@ -1,78 +1,75 @@
 import numpy as np
+import pandas as pd
+from common.enum import NoiseEngineType
+from common.model_configs import NOISE_WINDOW_S
+from noise.cell_noise_statistics import EMPTY_TICK_ENERGY, CellNoiseStatistics
+from noise.engine import get_noise_engine
+from noise.engine.noise_engine_base import NoiseEngine
 from noise.grid_generator import compute_grid_dimensions, build_cell_matrix
-from noise.noise_math_utils import calculate_noise_at_distance, calculate_mixed_noise_level, calculate_distance
+from noise.noise_data_processor import generate_drone_noise_df
 
-from numba import njit, prange
 from tqdm import tqdm
 
 
-@njit(parallel=True)
-def calculate_cells_noise(cell_northings, cell_eastings, drone_northings, drone_eastings, drone_altitudes):
-    num_cells = len(cell_northings)
-    num_drones = len(drone_northings)
-
-    total_noise_result = np.zeros(num_cells, dtype=np.float64)
-
-    for i in prange(num_cells):
-        centroid_northings = cell_northings[i]
-        centroid_eastings = cell_eastings[i]
-
-        noises = np.empty(num_drones, dtype=np.float64)
-        for j in range(num_drones):
-            delta_northing = centroid_northings - drone_northings[j]
-            delta_easting = centroid_eastings - drone_eastings[j]
-
-            distance = calculate_distance(delta_northing, delta_easting, drone_altitudes[j])
-
-            noises[j] = calculate_noise_at_distance(distance)
-
-        total_noise_result[i] = calculate_mixed_noise_level(noises)
-
-    return total_noise_result
-
-
 class NoiseTracker:
-    def __init__(self):
+    def __init__(self, engine_type: NoiseEngineType = NoiseEngineType.EXACT, window_s: int = NOISE_WINDOW_S):
+        self.engine_type = engine_type
         self.rows, self.cols = compute_grid_dimensions()
         self.drone_location_history = []
         self.drone_altitude_history = []
 
         self.noise_cells = build_cell_matrix()
+        self.statistics = CellNoiseStatistics(len(self.noise_cells), window_s=window_s)
 
     def track_drones(self, drones):
         self.drone_location_history.append([drone.current_location for drone in drones])
         self.drone_altitude_history.append([drone.current_altitude for drone in drones])
 
+    def build_drone_noise_df(self) -> pd.DataFrame:
+        return generate_drone_noise_df(self.noise_cells, self.statistics)
+
     def calculate_noise_cells(self):
+        engine = self._create_engine()
+
+        try:
+            with tqdm(total=len(self.drone_location_history), desc="Calculating Noise Matrix", unit="iteration") as pbar:
+                for drone_locations, drone_altitudes in zip(self.drone_location_history, self.drone_altitude_history):
+                    add_tick_noise(engine, self.statistics, *drone_position_arrays(drone_locations, drone_altitudes))
+
+                    pbar.update(1)
+        finally:
+            engine.close()
+
+    def close(self):
+        """Releases whatever the tracker still holds once the run is over or abandoned; safe to call twice."""
+        pass
+
+    def _create_engine(self) -> NoiseEngine:
         cell_northings = np.array([cell.centroid.northing for cell in self.noise_cells], dtype=np.float64)
         cell_eastings = np.array([cell.centroid.easting for cell in self.noise_cells], dtype=np.float64)
 
-        with tqdm(total=len(self.drone_location_history), desc="Calculating Noise Matrix", unit="iteration") as pbar:
-            for drone_locations, drone_altitudes in zip(self.drone_location_history, self.drone_altitude_history):
-                drone_northings = np.array(
-                    [loc.northing for loc in drone_locations],
-                    dtype=np.float64
-                )
-
-                drone_eastings = np.array(
-                    [loc.easting for loc in drone_locations],
-                    dtype=np.float64
-                )
-
-                drone_altitudes = np.array(
-                    drone_altitudes,
-                    dtype=np.float64
-                )
-
-                total_noise = calculate_cells_noise(
-                    cell_northings,
-                    cell_eastings,
-                    drone_northings,
-                    drone_eastings,
-                    drone_altitudes
-                )
-
-                for cell, noise in zip(self.noise_cells, total_noise):
-                    cell.add_noise(noise)
-
-                pbar.update(1)
+        return get_noise_engine(self.engine_type, cell_northings, cell_eastings)
+
+
+def drone_position_arrays(drone_locations, drone_altitudes) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    return (
+        np.array([loc.northing for loc in drone_locations], dtype=np.float64),
+        np.array([loc.easting for loc in drone_locations], dtype=np.float64),
+        np.array(drone_altitudes, dtype=np.float64),
+    )
+
+
+def add_tick_noise(
+    engine: NoiseEngine,
+    statistics: CellNoiseStatistics,
+    drone_northings: np.ndarray,
+    drone_eastings: np.ndarray,
+    drone_altitudes: np.ndarray,
+    tick_index: int | None = None,
+):
+    if len(drone_northings) == 0:
+        total_energy = np.full(len(engine.cell_northings), EMPTY_TICK_ENERGY, dtype=np.float64)
+    else:
+        total_energy = engine.calculate_energy(drone_northings, drone_eastings, drone_altitudes)
+
+    statistics.add_tick(10.0 * np.log10(total_energy), total_energy, tick_index)
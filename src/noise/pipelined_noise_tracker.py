@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import queue
+import threading
+
+import numba
+
+from common.enum import NoiseEngineType
+from common.model_configs import NOISE_WINDOW_S
+from noise.noise_tracker import NoiseTracker, add_tick_noise, drone_position_arrays
+
+# ticks the simulation may run ahead of the noise worker before capture blocks
+NOISE_PIPELINE_QUEUE_TICKS = 64
+
+_END_OF_RUN = None
+
+
+class PipelinedNoiseTracker(NoiseTracker):
+    """
+    NoiseTracker whose per-tick noise is accumulated by a background thread while the simulation runs.
+    Captured ticks travel as compact position arrays through a bounded queue, so a slow noise engine holds
+    the simulation back instead of letting the backlog grow. The numba kernels release the GIL, which is
+    what lets the two threads overlap.
+    """
+
+    def __init__(
+        self,
+        engine_type: NoiseEngineType = NoiseEngineType.EXACT,
+        window_s: int = NOISE_WINDOW_S,
+        queue_ticks: int = NOISE_PIPELINE_QUEUE_TICKS,
+    ):
+        super().__init__(engine_type, window_s)
+
+        self._ticks = queue.Queue(maxsize=queue_ticks)
+        self._worker_error: BaseException | None = None
+
+        # numba's thread pool has to be started from the main thread, a pool first launched by the worker
+        # (TBB in particular) keeps the interpreter from exiting
+        numba.get_num_threads()
+
+        self._worker = threading.Thread(target=self._accumulate_ticks, name="noise-pipeline", daemon=True)
+        self._worker.start()
+
+    def track_drones(self, drones):
+        self._raise_worker_error()
+
+        positions = drone_position_arrays(
+            [drone.current_location for drone in drones],
+            [drone.current_altitude for drone in drones],
+        )
+        self._ticks.put(positions)
+
+    def calculate_noise_cells(self):
+        self.close()
+        self._raise_worker_error()
+
+    def close(self):
+        if self._worker.is_alive():
+            self._ticks.put(_END_OF_RUN)
+            self._worker.join()
+
+    def _accumulate_ticks(self):
+        try:
+            engine = self._create_engine()
+            try:
+                while (positions := self._ticks.get()) is not _END_OF_RUN:
+                    add_tick_noise(engine, self.statistics, *positions)
+            finally:
+                engine.close()
+        except BaseException as e:
+            self._worker_error = e
+            # keeps draining, so a simulation blocked on a full queue still reaches calculate_noise_cells
+            while self._ticks.get() is not _END_OF_RUN:
+                pass
+
+    def _raise_worker_error(self):
+        if self._worker_error is not None:
+            raise RuntimeError("Noise pipeline worker failed") from self._worker_error
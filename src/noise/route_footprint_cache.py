@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import NamedTuple
+
+import numpy as np
+
+FOOTPRINT_DTYPE = np.float32
+
+
+class RouteFootprintKey(NamedTuple):
+    start_northing: float
+    start_easting: float
+    end_northing: float
+    end_easting: float
+    waypoint_count: int
+    flown_waypoint_count: int
+
+
+class RouteFootprintCache:
+    """
+    Per-cell noise energy a single leg leaves behind, summed over the waypoints that were actually flown.
+    Legs only depend on their route, so the same footprint is valid for every run of a sweep that shares
+    the dataset and navigation type. Least recently used footprints go first once max_bytes is reached.
+    """
+
+    def __init__(self, max_bytes: int | None = None):
+        self._max_bytes = max_bytes
+        self._footprints: OrderedDict[RouteFootprintKey, np.ndarray] = OrderedDict()
+        self._byte_size = 0
+
+        self.hit_count = 0
+        self.miss_count = 0
+
+    @property
+    def entry_count(self) -> int:
+        return len(self._footprints)
+
+    @property
+    def byte_size(self) -> int:
+        return self._byte_size
+
+    def get(self, key: RouteFootprintKey) -> np.ndarray | None:
+        footprint = self._footprints.get(key)
+        if footprint is None:
+            self.miss_count += 1
+            return None
+
+        self.hit_count += 1
+        self._footprints.move_to_end(key)
+        return footprint
+
+    def store(self, key: RouteFootprintKey, footprint: np.ndarray) -> np.ndarray:
+        """Keeps footprint as FOOTPRINT_DTYPE and returns that copy, so callers see the same values as on a hit."""
+        footprint = footprint.astype(FOOTPRINT_DTYPE)
+        footprint.flags.writeable = False
+
+        if self._max_bytes is not None and footprint.nbytes > self._max_bytes:
+            return footprint
+
+        previous = self._footprints.pop(key, None)
+        if previous is not None:
+            self._byte_size -= previous.nbytes
+
+        while self._max_bytes is not None and self._footprints and self._byte_size + footprint.nbytes > self._max_bytes:
+            _, evicted = self._footprints.popitem(last=False)
+            self._byte_size -= evicted.nbytes
+
+        self._footprints[key] = footprint
+        self._byte_size += footprint.nbytes
+        return footprint
+
+    def clear(self):
+        self._footprints.clear()
+        self._byte_size = 0
+        self.hit_count = 0
+        self.miss_count = 0
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from tqdm import tqdm
+
+from noise.cell_noise_statistics import EMPTY_TICK_ENERGY
+from noise.engine.exact_noise_engine import calculate_cells_noise_energy
+from noise.grid_generator import build_cell_matrix
+from noise.noise_data_processor import CELL_INDEX_DTYPE, NOISE_LEVEL_DTYPE
+from noise.route_footprint_cache import RouteFootprintCache, RouteFootprintKey
+from route_planner.planned_route import ALTITUDE_COLUMN, EASTING_COLUMN, NORTHING_COLUMN, PlannedRoute
+from route_planner.straight_line_trajectory import StraightLineTrajectory
+
+
+@dataclass
+class _FlownLeg:
+    route: PlannedRoute
+    flown_waypoint_count: int
+
+
+class RouteFootprintTracker:
+    """
+    Builds the run-level average noise from per-leg energy footprints instead of per-tick drone positions.
+    Every tick a delivering drone sits on the waypoint it just reached, so each leg contributes the energy of
+    its first flown_waypoint_count waypoints, legs cut off at the end of the day included. Per-tick
+    maxima are not decomposable per leg, so maximum_noise is not available in this mode.
+    """
+
+    def __init__(self, footprint_cache: RouteFootprintCache | None = None):
+        self.footprint_cache = footprint_cache if footprint_cache is not None else RouteFootprintCache()
+
+        self.noise_cells = build_cell_matrix()
+        self.tick_count = 0
+        self.empty_tick_count = 0
+
+        self._active_legs: dict[int, _FlownLeg] = {}
+        self._finished_legs: list[_FlownLeg] = []
+
+    def track_drones(self, drones):
+        self.tick_count += 1
+        if not drones:
+            self.empty_tick_count += 1
+
+        for drone in drones:
+            leg = self._active_legs.get(drone.drone_id)
+
+            # a new route object, or a route restarted from its beginning, means the drone started a new leg
+            if leg is None or leg.route is not drone.route or drone.waypoint_index < leg.flown_waypoint_count:
+                if leg is not None:
+                    self._finished_legs.append(leg)
+                self._active_legs[drone.drone_id] = _FlownLeg(drone.route, drone.waypoint_index)
+            else:
+                leg.flown_waypoint_count = drone.waypoint_index
+
+    def calculate_noise_cells(self):
+        cell_northings = np.array([cell.centroid.northing for cell in self.noise_cells], dtype=np.float64)
+        cell_eastings = np.array([cell.centroid.easting for cell in self.noise_cells], dtype=np.float64)
+
+        total_energy = np.full(len(self.noise_cells), EMPTY_TICK_ENERGY * self.empty_tick_count, dtype=np.float64)
+
+        flown_legs = self._finished_legs + list(self._active_legs.values())
+        for leg in tqdm(flown_legs, desc="Summing Route Footprints", unit="leg"):
+            total_energy += self._get_footprint(leg, cell_northings, cell_eastings)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.average_noise = 10.0 * np.log10(total_energy / self.tick_count)
+
+    def close(self):
+        pass
+
+    def build_drone_noise_df(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            "row": np.array([cell.row for cell in self.noise_cells], dtype=CELL_INDEX_DTYPE),
+            "col": np.array([cell.column for cell in self.noise_cells], dtype=CELL_INDEX_DTYPE),
+            "average_noise": self.average_noise.astype(NOISE_LEVEL_DTYPE),
+            "maximum_noise": np.full(len(self.noise_cells), np.nan, dtype=NOISE_LEVEL_DTYPE),
+        })
+
+    def _get_footprint(self, leg: _FlownLeg, cell_northings: np.ndarray, cell_eastings: np.ndarray) -> np.ndarray:
+        route = leg.route
+        waypoint_count = len(route)
+        start, end = route[0], route[waypoint_count - 1]
+        key = RouteFootprintKey(
+            start_northing=float(start[NORTHING_COLUMN]),
+            start_easting=float(start[EASTING_COLUMN]),
+            end_northing=float(end[NORTHING_COLUMN]),
+            end_easting=float(end[EASTING_COLUMN]),
+            waypoint_count=waypoint_count,
+            flown_waypoint_count=leg.flown_waypoint_count,
+        )
+
+        footprint = self.footprint_cache.get(key)
+        if footprint is None:
+            flown_waypoints = _route_waypoints(route)[:leg.flown_waypoint_count]
+            footprint = self.footprint_cache.store(key, calculate_cells_noise_energy(
+                cell_northings,
+                cell_eastings,
+                np.ascontiguousarray(flown_waypoints[:, NORTHING_COLUMN]),
+                np.ascontiguousarray(flown_waypoints[:, EASTING_COLUMN]),
+                np.ascontiguousarray(flown_waypoints[:, ALTITUDE_COLUMN]),
+            ))
+
+        return footprint
+
+
+def _route_waypoints(route: PlannedRoute) -> np.ndarray:
+    if isinstance(route, StraightLineTrajectory):
+        return route.to_array()
+
+    return np.asarray(route, dtype=np.float64)
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import json
+import os
+
+import numpy as np
+
+from common.model_configs import model_config
+
+TRAJECTORY_RECORD_DTYPE = np.dtype([("northing", "<f8"), ("easting", "<f8"), ("altitude", "<f8")])
+TICK_INDEX_DTYPE = np.dtype("<i8")
+
+POSITIONS_FILE_NAME = "positions.bin"
+TICK_INDEX_FILE_NAME = "ticks.bin"
+METADATA_FILE_NAME = "metadata.json"
+
+
+class TrajectoryLogWriter:
+    """
+    Append-only binary log of the drone positions captured every tick. positions.bin holds fixed-width
+    (northing, easting, altitude) records, ticks.bin the cumulative record count after every tick, so tick i
+    spans records ticks[i - 1]:ticks[i]. A tick is indexed only after its records are written.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+        with open(os.path.join(directory, METADATA_FILE_NAME), "w") as f:
+            json.dump({
+                "start_s": model_config.time.start_s,
+                "step_s": model_config.time.step_s,
+                "record_fields": list(TRAJECTORY_RECORD_DTYPE.names),
+            }, f)
+
+        self._positions_file = open(os.path.join(directory, POSITIONS_FILE_NAME), "wb")
+        self._tick_index_file = open(os.path.join(directory, TICK_INDEX_FILE_NAME), "wb")
+        self.record_count = 0
+        self.tick_count = 0
+
+    def write_tick(self, drones):
+        records = np.empty(len(drones), dtype=TRAJECTORY_RECORD_DTYPE)
+        records["northing"] = [drone.current_location.northing for drone in drones]
+        records["easting"] = [drone.current_location.easting for drone in drones]
+        records["altitude"] = [drone.current_altitude for drone in drones]
+
+        self._positions_file.write(records.tobytes())
+        self.record_count += len(records)
+        self.tick_count += 1
+        self._tick_index_file.write(np.array([self.record_count], dtype=TICK_INDEX_DTYPE).tobytes())
+
+    def close(self):
+        self._positions_file.close()
+        self._tick_index_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class TrajectoryLog:
+    """Memory-mapped read access to a log written by TrajectoryLogWriter."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+        with open(os.path.join(directory, METADATA_FILE_NAME)) as f:
+            self.metadata = json.load(f)
+
+        self.tick_ends = _memmap_or_empty(os.path.join(directory, TICK_INDEX_FILE_NAME), TICK_INDEX_DTYPE)
+        self.records = _memmap_or_empty(os.path.join(directory, POSITIONS_FILE_NAME), TRAJECTORY_RECORD_DTYPE)
+
+    @property
+    def tick_count(self) -> int:
+        return len(self.tick_ends)
+
+    def tick_positions(self, tick: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        start = int(self.tick_ends[tick - 1]) if tick > 0 else 0
+        records = self.records[start:int(self.tick_ends[tick])]
+
+        return (
+            np.ascontiguousarray(records["northing"]),
+            np.ascontiguousarray(records["easting"]),
+            np.ascontiguousarray(records["altitude"]),
+        )
+
+
+def _memmap_or_empty(path: str, dtype: np.dtype) -> np.ndarray:
+    # numpy refuses to map an empty file, which is what a run without any captured tick leaves behind
+    if os.path.getsize(path) == 0:
+        return np.empty(0, dtype=dtype)
+
+    return np.memmap(path, dtype=dtype, mode="r")
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from multiprocessing.util import Finalize
+
+import numpy as np
+import pandas as pd
+from tqdm import tqdm
+
+from common.enum import NoiseEngineType
+from common.model_configs import NOISE_WINDOW_S, model_config
+from noise.cell_noise_statistics import CellNoiseStatistics
+from noise.engine import get_noise_engine
+from noise.engine.noise_engine_base import NoiseEngine
+from noise.grid_generator import build_cell_matrix
+from noise.noise_data_processor import generate_drone_noise_df
+from noise.noise_tracker import add_tick_noise
+from noise.trajectory_log import TrajectoryLog
+
+def evaluate_trajectory_log(
+    log_directory: str,
+    engine_type: NoiseEngineType = NoiseEngineType.EXACT,
+    window_s: int = NOISE_WINDOW_S,
+    max_workers: int | None = None,
+) -> pd.DataFrame:
+    """
+    Drone noise frame of a recorded run, recomputed with the current noise model and grid. The ticks are
+    split into one contiguous range per worker process, so every worker sends back a single statistics
+    object however long the run, and those are merged.
+    """
+    log = TrajectoryLog(log_directory)
+    _check_log_time_step(log)
+
+    worker_count = max_workers or os.cpu_count() or 1
+    range_bounds = np.linspace(0, log.tick_count, worker_count + 1).astype(np.int64).tolist()
+    tick_ranges = [(first, last) for first, last in zip(range_bounds[:-1], range_bounds[1:]) if last > first]
+
+    noise_cells = build_cell_matrix()
+    statistics = CellNoiseStatistics(len(noise_cells), window_s=window_s)
+    evaluate_range = partial(_evaluate_tick_range, window_s)
+
+    # spawned rather than forked, as forking a process that already runs numba's TBB pool blocks its exit;
+    # every worker maps the log and builds its grid and engine once, tasks only carry tick ranges
+    with ProcessPoolExecutor(
+        max_workers=worker_count,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_evaluation_worker,
+        initargs=(log_directory, engine_type),
+    ) as executor:
+        for range_statistics in tqdm(executor.map(evaluate_range, tick_ranges), total=len(tick_ranges), desc="Evaluating Trajectory Log"):
+            statistics.merge(range_statistics)
+
+    return generate_drone_noise_df(noise_cells, statistics)
+
+
+def _check_log_time_step(log: TrajectoryLog):
+    # ticks are placed in time windows by their index, which only holds on the clock the run was recorded with
+    recorded = (log.metadata["start_s"], log.metadata["step_s"])
+    configured = (model_config.time.start_s, model_config.time.step_s)
+    if recorded != configured:
+        raise ValueError(
+            f"Trajectory log starts at {recorded[0]} s with {recorded[1]} s ticks, "
+            f"but the model starts at {configured[0]} s with {configured[1]} s ticks"
+        )
+
+
+_WORKER_LOG: TrajectoryLog | None = None
+_WORKER_ENGINE: NoiseEngine | None = None
+_WORKER_CELL_COUNT = 0
+
+
+def _init_evaluation_worker(log_directory: str, engine_type: NoiseEngineType):
+    global _WORKER_LOG, _WORKER_ENGINE, _WORKER_CELL_COUNT
+    noise_cells = build_cell_matrix()
+
+    cell_northings = np.array([cell.centroid.northing for cell in noise_cells], dtype=np.float64)
+    cell_eastings = np.array([cell.centroid.easting for cell in noise_cells], dtype=np.float64)
+
+    _WORKER_LOG = TrajectoryLog(log_directory)
+    _WORKER_ENGINE = get_noise_engine(engine_type, cell_northings, cell_eastings)
+    _WORKER_CELL_COUNT = len(noise_cells)
+
+    # pool workers leave through multiprocessing's exit hooks, which skip atexit but run finalizers; this one
+    # has to run before the multiprocessing queues close (priority 10), so an engine's own pool still shuts down
+    Finalize(_WORKER_ENGINE, _WORKER_ENGINE.close, exitpriority=20)
+
+
+def _evaluate_tick_range(window_s: int, tick_range: tuple[int, int]) -> CellNoiseStatistics:
+    statistics = CellNoiseStatistics(_WORKER_CELL_COUNT, window_s=window_s)
+    for tick in range(*tick_range):
+        add_tick_noise(_WORKER_ENGINE, statistics, *_WORKER_LOG.tick_positions(tick), tick_index=tick)
+
+    return statistics
@@ -1,8 +1,6 @@
 import random
 
-from shapely.geometry import Point
-
-from census_analysis.msoa_data import MSOA_DATA
+from census_analysis.msoa_data import get_msoa_data
 from common.coordinate import Coordinate
 from common.enum import OrderDatasetType
 from common.file_utils import save_df_to_csv, load_df_from_csv
@@ -35,43 +33,22 @@ def load_orders(number_of_orders, path=None):
     return orders
 
 
-def generate_random_point_in_msoa(msoa_code, polygon, max_attempts=10000):
-    if not polygon.is_valid:
-        polygon = polygon.buffer(0)
-
-    if not polygon.is_valid or polygon.area == 0:
-        return polygon.centroid
-
-    # Proceed with random sampling if the polygon has a valid area
-    minx, miny, maxx, maxy = polygon.bounds
-
-    for _ in range(max_attempts):
-        randx = random.uniform(minx, maxx)
-        randy = random.uniform(miny, maxy)
-        point = Point(randx, randy)
-        if polygon.contains(point):
-            return point
-
-    print(msoa_code)
-    return polygon.centroid
-
-
 def generate_point_for_msoa(msoa_code):
-    polygon = MSOA_DATA.msoa_index.get(msoa_code)
-    if not polygon:
+    msoa_data = get_msoa_data()
+    if msoa_code not in msoa_data.msoa_positions:
         raise ValueError(f"No polygon found for MSOA code: {msoa_code}")
 
-    random_point = generate_random_point_in_msoa(msoa_code, polygon)
-    return round(random_point.x, 2), round(random_point.y, 2)
+    x, y = msoa_data.sample_point(msoa_code, random)
+    return round(x, 2), round(y, 2)
 
 
 def generate_random_population_based_point():
-    random_value = random.random()
-    for msoa_code, msoa_pop_distribution in MSOA_DATA.population_distribution:
-        if random_value <= msoa_pop_distribution:
-            x, y = generate_point_for_msoa(msoa_code)
-            return msoa_code, x, y
-    return None
+    msoa_code = get_msoa_data().find_msoa_by_population_share(random.random())
+    if msoa_code is None:
+        return None
+
+    x, y = generate_point_for_msoa(msoa_code)
+    return msoa_code, x, y
 
 
 def distance_between_points(warehouse_coordinates, point_coordinates):
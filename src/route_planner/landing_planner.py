@@ -1,50 +1,57 @@
+import numpy as np
+
 from common.model_configs import model_config
 from common.runtime_configs import get_simulation_config
+from route_planner.planned_route import ALTITUDE_COLUMN, EASTING_COLUMN, NORTHING_COLUMN
 
 NUMBER_OF_LANDING_STEPS = model_config.landing_steps
 
 DRONE_FLIGHT_ALTITUDE = model_config.drone.flight_altitude_m
 
-INTERMEDIATE_ALTITUDES_ASCENDING = model_config.intermediate_altitudes_ascending
-INTERMEDIATE_ALTITUDES_DESCENDING = model_config.intermediate_altitudes_descending
+INTERMEDIATE_ALTITUDES_ASCENDING = np.array(model_config.intermediate_altitudes_ascending, dtype=np.float64)
+INTERMEDIATE_ALTITUDES_DESCENDING = np.array(model_config.intermediate_altitudes_descending, dtype=np.float64)
 
 
 class LandingPlanner:
     def __init__(self):
         self.use_drone_landing = get_simulation_config().drone_landing
+        self.landing_steps = NUMBER_OF_LANDING_STEPS if self.use_drone_landing else 0
+
+    def build_planned_route(self, route):
+        return self.build_planned_routes([route])[0]
+
+    def build_planned_routes(self, routes):
+        if not routes:
+            return []
 
-    def add_landing_sequence(self, route, start, end):
-        if self.is_zero_distance_route(route) and self.use_drone_landing:
-            count = 1 + 2 * NUMBER_OF_LANDING_STEPS
-            return [start] * count
+        flight_lengths = np.fromiter((len(route) for route in routes), dtype=np.int64, count=len(routes))
+        flight_starts = np.cumsum(flight_lengths) - flight_lengths
+        flight_points = np.concatenate(routes)
 
-        if self.use_drone_landing:
-            return self._pad_landing_sequence(route, start, end)
+        padded_lengths = flight_lengths + 2 * self.landing_steps
+        padded_ends = np.cumsum(padded_lengths)
+        route_index = np.repeat(np.arange(len(routes)), padded_lengths)
+        waypoint_index = np.arange(padded_ends[-1]) - (padded_ends - padded_lengths)[route_index]
 
-        return route
+        flight_index = np.clip(waypoint_index - self.landing_steps, 0, flight_lengths[route_index] - 1)
+        source_index = flight_starts[route_index] + flight_index
 
-    def assign_altitudes(self, route):
-        if self.is_zero_distance_route(route):
-            return [DRONE_FLIGHT_ALTITUDE]
+        planned_routes = np.empty((padded_ends[-1], 3), dtype=np.float64)
+        planned_routes[:, [NORTHING_COLUMN, EASTING_COLUMN]] = flight_points[source_index]
+        planned_routes[:, ALTITUDE_COLUMN] = self._altitudes(waypoint_index, flight_lengths[route_index])
 
-        if self.use_drone_landing:
-            path_len = len(route) - 2 * NUMBER_OF_LANDING_STEPS
-            return self._landing_altitudes(path_len)
+        return np.split(planned_routes, padded_ends[:-1])
 
-        return [DRONE_FLIGHT_ALTITUDE] * len(route)
+    def _altitudes(self, waypoint_index, flight_lengths):
+        altitudes = np.full(waypoint_index.shape, DRONE_FLIGHT_ALTITUDE, dtype=np.float64)
+        if self.landing_steps == 0:
+            return altitudes
 
-    @staticmethod
-    def is_zero_distance_route(route):
-        return len(route) == 1
+        ascending = waypoint_index < self.landing_steps
+        altitudes[ascending] = INTERMEDIATE_ALTITUDES_ASCENDING[waypoint_index[ascending]]
 
-    @staticmethod
-    def _landing_altitudes(mid_len):
-        return (
-            INTERMEDIATE_ALTITUDES_ASCENDING +
-            [DRONE_FLIGHT_ALTITUDE] * mid_len +
-            INTERMEDIATE_ALTITUDES_DESCENDING
-        )
+        descending_index = waypoint_index - self.landing_steps - flight_lengths
+        descending = descending_index >= 0
+        altitudes[descending] = INTERMEDIATE_ALTITUDES_DESCENDING[descending_index[descending]]
 
-    @staticmethod
-    def _pad_landing_sequence(route, start, end):
-        return [start] * NUMBER_OF_LANDING_STEPS + route + [end] * NUMBER_OF_LANDING_STEPS
+        return altitudes
@@ -4,6 +4,7 @@ from common.coordinate import Coordinate, calculate_distance
 from common.model_configs import model_config
 from common.runtime_configs import get_simulation_config
 from noise.navigator import get_navigator
+from route_planner.planned_route import coordinates_to_array
 from route_planner.route_planner import RoutePlanner
 
 MODEL_TIME_STEP = model_config.time.step_s
@@ -19,20 +20,20 @@ class NoiseBasedPlanner(RoutePlanner):
             compute_on_miss=getattr(runtime_config, "compute_on_miss", False),
         )
 
-    def plan_route(self, start: Coordinate, end: Coordinate) -> list[Coordinate]:
+    def plan_route(self, start: Coordinate, end: Coordinate) -> np.ndarray:
         if calculate_distance(start, end) == 0:
-            return [start]
+            return coordinates_to_array([start])
 
         path_nodes = self.navigator.get_optimal_route(start, end)
         if not path_nodes:
-            return [start, end]
+            return coordinates_to_array([start, end])
 
         coords = self.navigator.nodes_to_coordinates(path_nodes)
         sampled = resample_polyline_by_time(coords, speed=DRONE_SPEED, dt=MODEL_TIME_STEP)
 
         sampled[0] = start
         sampled[-1] = end
-        return sampled
+        return coordinates_to_array(sampled)
 
 
 def resample_polyline_by_time(coords: list[Coordinate], speed: float, dt: float) -> list[Coordinate]:
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from typing import Iterable, Union
+
+import numpy as np
+
+from common.coordinate import Coordinate
+from route_planner.straight_line_trajectory import StraightLineTrajectory
+
+NORTHING_COLUMN = 0
+EASTING_COLUMN = 1
+ALTITUDE_COLUMN = 2
+
+PlannedRoute = Union[np.ndarray, StraightLineTrajectory]
+
+EMPTY_ROUTE = np.empty((0, 3), dtype=np.float64)
+EMPTY_ROUTE.flags.writeable = False
+
+
+def coordinates_to_array(coordinates: Iterable[Coordinate]) -> np.ndarray:
+    points = [(coordinate.northing, coordinate.easting) for coordinate in coordinates]
+    return np.array(points, dtype=np.float64).reshape(-1, 2)
+
+
+def reverse_route(route: PlannedRoute) -> PlannedRoute:
+    if isinstance(route, StraightLineTrajectory):
+        return route.reversed()
+
+    return route[::-1]
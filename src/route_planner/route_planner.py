@@ -4,3 +4,6 @@ from common.coordinate import Coordinate
 class RoutePlanner:
     def plan_route(self, start: Coordinate, end: Coordinate):
         raise NotImplementedError
+
+    def plan_routes(self, starts: list[Coordinate], ends: list[Coordinate]):
+        return [self.plan_route(start, end) for start, end in zip(starts, ends)]
@@ -1,6 +1,10 @@
-from common.coordinate import Coordinate, calculate_distance
+import numpy as np
+
+from common.coordinate import calculate_distance
 from common.model_configs import model_config
+from route_planner.planned_route import coordinates_to_array
 from route_planner.route_planner import RoutePlanner
+from route_planner.straight_line_trajectory import StraightLineTrajectory
 
 MODEL_TIME_STEP = model_config.time.step_s
 DRONE_SPEED = model_config.drone.speed_mps
@@ -8,28 +12,56 @@ DRONE_SPEED = model_config.drone.speed_mps
 
 class StraightLinePlanner(RoutePlanner):
     def plan_route(self, start, end):
-        distance = calculate_distance(start, end)
-        if distance == 0:
-            return [start]
+        start_point = np.array((start.northing, start.easting), dtype=np.float64)
+        end_point = np.array((end.northing, end.easting), dtype=np.float64)
+
+        number_of_points = int(count_route_points(calculate_distance(start, end)))
+        if number_of_points == 1:
+            return start_point.reshape(1, 2)
+
+        return np.linspace(start_point, end_point, number_of_points)
+
+    def plan_routes(self, starts, ends):
+        if not starts:
+            return []
+
+        start_points = coordinates_to_array(starts)
+        end_points = coordinates_to_array(ends)
+
+        points_per_route = count_route_points(np.hypot(*(end_points - start_points).T))
+        route_ends = np.cumsum(points_per_route)
+        route_starts = route_ends - points_per_route
+
+        route_index = np.repeat(np.arange(len(points_per_route)), points_per_route)
+        waypoint_index = np.arange(route_ends[-1]) - route_starts[route_index]
+        segments = np.maximum(points_per_route - 1, 1)[route_index]
+        fractions = (waypoint_index / segments)[:, None]
 
-        total_time = distance / DRONE_SPEED
-        steps = int(total_time // MODEL_TIME_STEP)
+        # (1 - t) * a + t * b keeps both endpoints bit-exact, which the dispatcher relies on
+        points = (1.0 - fractions) * start_points[route_index] + fractions * end_points[route_index]
+        return np.split(points, route_ends[:-1])
 
-        if steps == 0:
-            return [start, end]
+    def plan_trajectories(self, starts, ends, landing_steps):
+        if not starts:
+            return []
 
-        delta_e = end.easting - start.easting
-        delta_n = end.northing - start.northing
+        start_points = coordinates_to_array(starts)
+        end_points = coordinates_to_array(ends)
+        points_per_route = count_route_points(np.hypot(*(end_points - start_points).T))
 
-        route = [
-            Coordinate(
-                start.northing + delta_n * (i / steps),
-                start.easting + delta_e * (i / steps)
+        return [
+            StraightLineTrajectory(
+                start_northing=start.northing,
+                start_easting=start.easting,
+                end_northing=end.northing,
+                end_easting=end.easting,
+                flight_points=flight_points,
+                landing_steps=landing_steps,
             )
-            for i in range(steps + 1)
+            for start, end, flight_points in zip(starts, ends, points_per_route.tolist())
         ]
 
-        if route[-1] != end:
-            route.append(end)
 
-        return route
+def count_route_points(distances):
+    steps = np.floor_divide(np.divide(distances, DRONE_SPEED), MODEL_TIME_STEP).astype(np.int64)
+    return np.where(np.equal(distances, 0), 1, np.maximum(steps, 1) + 1)
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from common.model_configs import model_config
+
+DRONE_FLIGHT_ALTITUDE = model_config.drone.flight_altitude_m
+
+INTERMEDIATE_ALTITUDES_ASCENDING = tuple(model_config.intermediate_altitudes_ascending)
+INTERMEDIATE_ALTITUDES_DESCENDING = tuple(model_config.intermediate_altitudes_descending)
+
+
+@dataclass(frozen=True, slots=True)
+class StraightLineTrajectory:
+    start_northing: float
+    start_easting: float
+    end_northing: float
+    end_easting: float
+    flight_points: int
+    landing_steps: int
+
+    def __len__(self) -> int:
+        return self.flight_points + 2 * self.landing_steps
+
+    def __getitem__(self, index: int) -> tuple[float, float, float]:
+        if not 0 <= index < len(self):
+            raise IndexError(f"Waypoint {index} is outside a trajectory of {len(self)} waypoints")
+
+        return (*self.position_at(index), self.altitude_at(index))
+
+    def position_at(self, index: int) -> tuple[float, float]:
+        flight_index = min(max(index - self.landing_steps, 0), self.flight_points - 1)
+        fraction = flight_index / (self.flight_points - 1) if self.flight_points > 1 else 0.0
+
+        northing = (1.0 - fraction) * self.start_northing + fraction * self.end_northing
+        easting = (1.0 - fraction) * self.start_easting + fraction * self.end_easting
+        return northing, easting
+
+    def altitude_at(self, index: int) -> float:
+        if index < self.landing_steps:
+            return INTERMEDIATE_ALTITUDES_ASCENDING[index]
+
+        descending_index = index - self.landing_steps - self.flight_points
+        if descending_index >= 0:
+            return INTERMEDIATE_ALTITUDES_DESCENDING[descending_index]
+
+        return DRONE_FLIGHT_ALTITUDE
+
+    def reversed(self) -> StraightLineTrajectory:
+        return StraightLineTrajectory(
+            start_northing=self.end_northing,
+            start_easting=self.end_easting,
+            end_northing=self.start_northing,
+            end_easting=self.start_easting,
+            flight_points=self.flight_points,
+            landing_steps=self.landing_steps,
+        )
+
+    def to_array(self) -> np.ndarray:
+        return np.array([self[index] for index in range(len(self))], dtype=np.float64).reshape(-1, 3)
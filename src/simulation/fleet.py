@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from common.enum import DroneStatus
 from drones.drone_generator import DroneGenerator
+from route_planner.planned_route import reverse_route
 from simulation.planned_route_cache import PlannedRouteCache
 from simulation.planner import PathPlanner
 
@@ -33,37 +34,37 @@ class Fleet:
         return bool(self.waiting_planning_drones)
 
     def plan_drones_path(self):
-        for drone in self.waiting_planning_drones:
-            self._plan_for_drone(drone)
+        drones_to_plan = [drone for drone in self.waiting_planning_drones if not self._assign_return_leg(drone)]
 
-            if drone not in self.delivering_drones:
-                self.delivering_drones.append(drone)
+        planned_routes = self.planner.plan_batch(
+            starts=[drone.current_location for drone in drones_to_plan],
+            ends=[drone.destination for drone in drones_to_plan],
+        )
 
-        self.waiting_planning_drones = self._get_difference(self.waiting_planning_drones, self.delivering_drones)
+        for drone, planned_route in zip(drones_to_plan, planned_routes):
+            drone.assign_route(planned_route)
 
-    def _plan_for_drone(self, drone):
-        if drone.status is DroneStatus.RETURNING:
-            cached = drone.pop_pending_return_leg()
-            if cached is not None:
-                route, altitudes = cached
-                drone.assign_route(route, altitudes)
-                return
+            if drone.status is DroneStatus.PREPARING:
+                drone.set_pending_return_leg(reverse_route(planned_route))
 
-        route, altitudes = self.planner.plan(start=drone.current_location, end=drone.destination)
-        drone.assign_route(route, altitudes)
+        delivering_drones = set(self.delivering_drones)
+        self.delivering_drones.extend(
+            drone for drone in self.waiting_planning_drones if drone not in delivering_drones
+        )
 
-        if drone.status is DroneStatus.PREPARING:
-            self._store_return_leg_from_outbound(drone, route, altitudes)
+        self.waiting_planning_drones = []
 
     @staticmethod
-    def _store_return_leg_from_outbound(drone, outbound_route, outbound_altitudes):
-        if not outbound_route:
-            return
+    def _assign_return_leg(drone):
+        if drone.status is not DroneStatus.RETURNING:
+            return False
 
-        return_route = list(reversed(outbound_route))
-        return_altitudes = list(reversed(outbound_altitudes)) if outbound_altitudes else []
+        return_route = drone.pop_pending_return_leg()
+        if return_route is None:
+            return False
 
-        drone.set_pending_return_leg(return_route, return_altitudes)
+        drone.assign_route(return_route)
+        return True
 
     def update_drones(self):
         for drone in self.delivering_drones:
@@ -75,7 +76,3 @@ class Fleet:
         self.waiting_planning_drones.extend([
             drone for drone in self.delivering_drones if drone.need_planning is True
         ])
-
-    @staticmethod
-    def _get_difference(primary_list, exclusion_list):
-        return [element for element in primary_list if element not in exclusion_list]
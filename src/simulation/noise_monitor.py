@@ -1,17 +1,64 @@
-from noise.noise_data_processor import combine_base_and_drone_noise
+from __future__ import annotations
+
+from common.enum import NoiseEngineType
+from common.model_configs import NOISE_WINDOW_S
+from noise.noise_data_processor import combine_noise_levels, load_base_noise_levels
 from noise.noise_tracker import NoiseTracker
+from noise.pipelined_noise_tracker import PipelinedNoiseTracker
+from noise.route_footprint_cache import RouteFootprintCache
+from noise.route_footprint_tracker import RouteFootprintTracker
+from noise.trajectory_log import TrajectoryLogWriter
 
 
 class NoiseMonitor:
-    def __init__(self):
-        self.tracker = NoiseTracker()
+    def __init__(
+        self,
+        noise_engine: NoiseEngineType = NoiseEngineType.EXACT,
+        use_route_footprints: bool = False,
+        route_footprint_cache: RouteFootprintCache | None = None,
+        noise_window_s: int = NOISE_WINDOW_S,
+        trajectory_log_directory: str | None = None,
+        pipeline_noise: bool = False,
+    ):
+        if use_route_footprints:
+            print(
+                "Route footprints only produce the day-level average_noise; maximum_noise, percentile levels, "
+                "minutes above thresholds and windowed averages are not computed in this mode."
+            )
+            self.tracker = RouteFootprintTracker(route_footprint_cache)
+        elif pipeline_noise:
+            self.tracker = PipelinedNoiseTracker(noise_engine, window_s=noise_window_s)
+        else:
+            self.tracker = NoiseTracker(noise_engine, window_s=noise_window_s)
 
+        self.trajectory_log = TrajectoryLogWriter(trajectory_log_directory) if trajectory_log_directory else None
         self.impact = None
 
     def capture(self, drones):
         self.tracker.track_drones(drones)
 
+        if self.trajectory_log is not None:
+            self.trajectory_log.write_tick(drones)
+
     def finish(self):
-        self.tracker.calculate_noise_cells()
+        self.calculate_noise_cells()
+        self.combine_with_base_noise()
+
+    def calculate_noise_cells(self):
+        try:
+            if self.trajectory_log is not None:
+                self.trajectory_log.close()
+                print(f"Trajectory log written to '{self.trajectory_log.directory}'")
+
+            self.tracker.calculate_noise_cells()
+        finally:
+            self.close()
+
+    def close(self):
+        self.tracker.close()
+
+        if self.trajectory_log is not None:
+            self.trajectory_log.close()
 
-        self.impact = combine_base_and_drone_noise(self.tracker.noise_cells)
+    def combine_with_base_noise(self):
+        self.impact = combine_noise_levels(self.tracker.build_drone_noise_df(), load_base_noise_levels())
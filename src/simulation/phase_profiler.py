@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import time
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+from simulation.planned_route_cache import PlannedRouteCache, PlannedRouteCacheStats
+
+# log-spaced per-call wall-time buckets, from 10 µs to 10 s; the last bucket catches anything slower
+TICK_HISTOGRAM_EDGES_SECONDS = tuple(10.0 ** exponent for exponent in range(-5, 2))
+
+
+class PhaseProfiler:
+    """
+    Cumulative wall and CPU time per simulation phase, plus every individual call's wall time for the
+    per-tick histogram. Only created when profiling is switched on; the unprofiled simulator never calls it.
+    """
+
+    def __init__(self, planned_route_cache: PlannedRouteCache | None = None):
+        self._wall_seconds = defaultdict(float)
+        self._cpu_seconds = defaultdict(float)
+        self._call_wall_seconds = defaultdict(list)
+
+        # the route cache outlives a single run, so its usage is measured against a snapshot
+        self._planned_route_cache = planned_route_cache
+        self._initial_cache_stats = planned_route_cache.get_stats() if planned_route_cache is not None else None
+
+    def measure(self, phase: str, function, *args):
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+
+        result = function(*args)
+
+        cpu_elapsed = time.process_time() - cpu_start
+        wall_elapsed = time.perf_counter() - wall_start
+
+        self._wall_seconds[phase] += wall_elapsed
+        self._cpu_seconds[phase] += cpu_elapsed
+        self._call_wall_seconds[phase].append(wall_elapsed)
+        return result
+
+    def planner_cache_usage(self) -> PlannedRouteCacheStats | None:
+        if self._planned_route_cache is None:
+            return None
+
+        return self._planned_route_cache.get_stats() - self._initial_cache_stats
+
+    def summary(self) -> pd.DataFrame:
+        histogram_edges = np.array((0.0, *TICK_HISTOGRAM_EDGES_SECONDS, np.inf))
+
+        rows = []
+        for phase, call_wall_seconds in self._call_wall_seconds.items():
+            call_wall_seconds = np.asarray(call_wall_seconds)
+            histogram, _ = np.histogram(call_wall_seconds, bins=histogram_edges)
+
+            rows.append({
+                "phase": phase,
+                "call_count": len(call_wall_seconds),
+                "wall_seconds": self._wall_seconds[phase],
+                "cpu_seconds": self._cpu_seconds[phase],
+                "median_call_seconds": float(np.median(call_wall_seconds)),
+                "p95_call_seconds": float(np.percentile(call_wall_seconds, 95)),
+                "max_call_seconds": float(call_wall_seconds.max()),
+                "call_histogram": histogram,
+            })
+
+        return pd.DataFrame(rows)
+
+    def print_summary(self):
+        summary = self.summary()
+        total_wall_seconds = summary["wall_seconds"].sum()
+
+        print("Phase timings:")
+        for phase in summary.itertuples():
+            share = phase.wall_seconds / total_wall_seconds if total_wall_seconds > 0 else 0.0
+            print(
+                f"  {phase.phase}: calls={phase.call_count}, wall={phase.wall_seconds:.3f}s ({share:.1%}), "
+                f"cpu={phase.cpu_seconds:.3f}s, median={phase.median_call_seconds * 1000:.3f}ms, "
+                f"p95={phase.p95_call_seconds * 1000:.3f}ms, max={phase.max_call_seconds * 1000:.3f}ms"
+            )
+
+        cache_usage = self.planner_cache_usage()
+        if cache_usage is not None:
+            print(
+                f"  planner cache: requests={cache_usage.request_count}, hits={cache_usage.hit_count}, "
+                f"disk_hits={cache_usage.disk_hit_count}, misses={cache_usage.miss_count}, "
+                f"hit_rate={cache_usage.hit_rate:.2%}"
+            )
+
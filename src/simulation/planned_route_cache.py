@@ -1,12 +1,22 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import sys
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, fields
+from typing import Hashable, NamedTuple
+
+import numpy as np
 
 from common.coordinate import Coordinate
+from common.enum import CacheEvictionPolicy
+from route_planner.planned_route import PlannedRoute
+from route_planner.straight_line_trajectory import StraightLineTrajectory
+from simulation.planned_route_store import PersistentPlannedRouteStore
 
+FLOAT_SIZE_BYTES = sys.getsizeof(0.0)
 
-@dataclass(frozen=True)
-class PlannedRouteKey:
+
+class PlannedRouteKey(NamedTuple):
     start_northing: float
     start_easting: float
     end_northing: float
@@ -14,9 +24,14 @@ class PlannedRouteKey:
 
 
 @dataclass(frozen=True)
-class StoredPlannedRoute:
-    route_coordinates: tuple[tuple[float, float], ...]
-    altitudes: tuple[float, ...]
+class PlannedRouteCacheLimits:
+    max_entries: int | None = None
+    max_bytes: int | None = None
+    eviction_policy: CacheEvictionPolicy = CacheEvictionPolicy.LRU
+
+    @property
+    def bounded(self) -> bool:
+        return self.max_entries is not None or self.max_bytes is not None
 
 
 @dataclass(frozen=True)
@@ -24,28 +39,138 @@ class PlannedRouteCacheStats:
     entry_count: int
     hit_count: int
     miss_count: int
+    byte_size: int = 0
+    eviction_count: int = 0
+    evicted_bytes: int = 0
+    disk_hit_count: int = 0
+    disk_entry_count: int = 0
 
     @property
     def request_count(self) -> int:
-        return self.hit_count + self.miss_count
+        return self.hit_count + self.disk_hit_count + self.miss_count
 
     @property
     def hit_rate(self) -> float:
         if self.request_count == 0:
             return 0.0
-        return self.hit_count / self.request_count
+        return (self.hit_count + self.disk_hit_count) / self.request_count
 
+    def __sub__(self, earlier: PlannedRouteCacheStats) -> PlannedRouteCacheStats:
+        """Change between an earlier snapshot of the same cache and this one."""
+        return PlannedRouteCacheStats(**{
+            stats_field.name: getattr(self, stats_field.name) - getattr(earlier, stats_field.name)
+            for stats_field in fields(self)
+        })
 
-class PlannedRouteCache:
+
+class _LruEvictionOrder:
     def __init__(self):
-        self._cached_routes: dict[PlannedRouteKey, StoredPlannedRoute] = {}
+        self._keys: OrderedDict[Hashable, None] = OrderedDict()
+
+    def add(self, key: Hashable):
+        self._keys[key] = None
+
+    def touch(self, key: Hashable):
+        self._keys.move_to_end(key)
+
+    def remove(self, key: Hashable):
+        self._keys.pop(key, None)
+
+    def pop_victim(self) -> Hashable:
+        victim, _ = self._keys.popitem(last=False)
+        return victim
+
+    def clear(self):
+        self._keys.clear()
+
+
+class _LfuEvictionOrder:
+    def __init__(self):
+        self._use_counts: dict[Hashable, int] = {}
+        self._keys_by_use_count: defaultdict[int, OrderedDict[Hashable, None]] = defaultdict(OrderedDict)
+        self._min_use_count = 0
+
+    def add(self, key: Hashable):
+        self._use_counts[key] = 1
+        self._keys_by_use_count[1][key] = None
+        self._min_use_count = 1
+
+    def touch(self, key: Hashable):
+        use_count = self._use_counts[key]
+        self._discard_from_bucket(key, use_count)
+
+        self._use_counts[key] = use_count + 1
+        self._keys_by_use_count[use_count + 1][key] = None
+
+        if self._min_use_count == use_count and use_count not in self._keys_by_use_count:
+            self._min_use_count = use_count + 1
+
+    def remove(self, key: Hashable):
+        use_count = self._use_counts.pop(key, None)
+        if use_count is not None:
+            self._discard_from_bucket(key, use_count)
+
+    def pop_victim(self) -> Hashable:
+        if self._min_use_count not in self._keys_by_use_count:
+            self._min_use_count = min(self._keys_by_use_count)
+
+        # least recently used among the least frequently used keys
+        victim = next(iter(self._keys_by_use_count[self._min_use_count]))
+        self.remove(victim)
+        return victim
+
+    def clear(self):
+        self._use_counts.clear()
+        self._keys_by_use_count.clear()
+        self._min_use_count = 0
+
+    def _discard_from_bucket(self, key: Hashable, use_count: int):
+        bucket = self._keys_by_use_count[use_count]
+        del bucket[key]
+        if not bucket:
+            del self._keys_by_use_count[use_count]
+
+
+def _create_eviction_order(policy: CacheEvictionPolicy):
+    if policy is CacheEvictionPolicy.LRU:
+        return _LruEvictionOrder()
+    if policy is CacheEvictionPolicy.LFU:
+        return _LfuEvictionOrder()
+    raise ValueError(f"Unknown cache eviction policy: {policy}")
+
+
+class PlannedRouteCache:
+    def __init__(
+        self,
+        limits: PlannedRouteCacheLimits | None = None,
+        persistent_store: PersistentPlannedRouteStore | None = None,
+    ):
+        self._limits = limits or PlannedRouteCacheLimits()
+        self._eviction_order = _create_eviction_order(self._limits.eviction_policy)
+        self._persistent_store = persistent_store
+
+        self._cached_routes: dict[PlannedRouteKey, PlannedRoute] = {}
+        self._entry_bytes: dict[PlannedRouteKey, int] = {}
+        self._byte_size = 0
+
         self._hit_count = 0
+        self._disk_hit_count = 0
         self._miss_count = 0
+        self._eviction_count = 0
+        self._evicted_bytes = 0
+
+    @property
+    def limits(self) -> PlannedRouteCacheLimits:
+        return self._limits
 
     @property
     def entry_count(self) -> int:
         return len(self._cached_routes)
 
+    @property
+    def byte_size(self) -> int:
+        return self._byte_size
+
     @property
     def hit_count(self) -> int:
         return self._hit_count
@@ -54,59 +179,138 @@ class PlannedRouteCache:
     def miss_count(self) -> int:
         return self._miss_count
 
+    @property
+    def eviction_count(self) -> int:
+        return self._eviction_count
+
     def get_stats(self) -> PlannedRouteCacheStats:
         return PlannedRouteCacheStats(
             entry_count=self.entry_count,
             hit_count=self.hit_count,
             miss_count=self.miss_count,
+            byte_size=self.byte_size,
+            eviction_count=self.eviction_count,
+            evicted_bytes=self._evicted_bytes,
+            disk_hit_count=self._disk_hit_count,
+            disk_entry_count=self._persistent_store.entry_count if self._persistent_store is not None else 0,
         )
 
-    def get(self, start: Coordinate, end: Coordinate) -> tuple[list[Coordinate], list[float]] | None:
+    def get(self, start: Coordinate, end: Coordinate) -> PlannedRoute | None:
         cache_key = self._build_cache_key(start, end)
         stored_planned_route = self._cached_routes.get(cache_key)
 
-        if stored_planned_route is None:
-            self._miss_count += 1
-            return None
+        if stored_planned_route is not None:
+            self._hit_count += 1
+            self._eviction_order.touch(cache_key)
+            return self._restore_planned_route(stored_planned_route)
+
+        persisted_planned_route = self._get_persisted(cache_key)
+        if persisted_planned_route is not None:
+            self._disk_hit_count += 1
+            self._insert(cache_key, persisted_planned_route)
+            return self._restore_planned_route(persisted_planned_route)
 
-        self._hit_count += 1
-        return self._restore_planned_route(stored_planned_route)
+        self._miss_count += 1
+        return None
 
-    def store(self, start: Coordinate, end: Coordinate, route: list[Coordinate], altitudes: list[float]):
+    def store(self, start: Coordinate, end: Coordinate, planned_route: PlannedRoute):
         cache_key = self._build_cache_key(start, end)
-        self._cached_routes[cache_key] = self._freeze_planned_route(route, altitudes)
+        stored_planned_route = self._freeze_planned_route(planned_route)
+
+        self._insert(cache_key, stored_planned_route)
+
+        if self._persistent_store is not None and not isinstance(stored_planned_route, StraightLineTrajectory):
+            self._persistent_store.store(cache_key, stored_planned_route)
+
+    def flush(self):
+        if self._persistent_store is not None:
+            self._persistent_store.flush()
 
     def clear(self):
         self._cached_routes.clear()
+        self._entry_bytes.clear()
+        self._eviction_order.clear()
+        self._byte_size = 0
         self._hit_count = 0
+        self._disk_hit_count = 0
         self._miss_count = 0
+        self._eviction_count = 0
+        self._evicted_bytes = 0
+
+    def _get_persisted(self, cache_key: PlannedRouteKey) -> np.ndarray | None:
+        if self._persistent_store is None:
+            return None
+
+        return self._persistent_store.get(cache_key)
+
+    def _insert(self, cache_key: PlannedRouteKey, stored_planned_route: PlannedRoute):
+        entry_bytes = self._estimate_entry_bytes(stored_planned_route)
+
+        self._remove(cache_key)
+
+        if not self._fits_in_budget(entry_bytes):
+            return
+
+        self._evict_until_room_for(entry_bytes)
+
+        self._cached_routes[cache_key] = stored_planned_route
+        self._entry_bytes[cache_key] = entry_bytes
+        self._byte_size += entry_bytes
+        self._eviction_order.add(cache_key)
+
+    def _fits_in_budget(self, entry_bytes: int) -> bool:
+        if self._limits.max_entries is not None and self._limits.max_entries <= 0:
+            return False
+        return self._limits.max_bytes is None or entry_bytes <= self._limits.max_bytes
+
+    def _evict_until_room_for(self, entry_bytes: int):
+        if not self._limits.bounded:
+            return
+
+        while self._cached_routes and self._is_over_budget(entry_bytes):
+            victim_key = self._eviction_order.pop_victim()
+            self._eviction_count += 1
+            self._evicted_bytes += self._entry_bytes[victim_key]
+            self._remove(victim_key)
+
+    def _is_over_budget(self, incoming_bytes: int) -> bool:
+        max_entries = self._limits.max_entries
+        if max_entries is not None and self.entry_count + 1 > max_entries:
+            return True
+
+        max_bytes = self._limits.max_bytes
+        return max_bytes is not None and self._byte_size + incoming_bytes > max_bytes
+
+    def _remove(self, cache_key: PlannedRouteKey):
+        if self._cached_routes.pop(cache_key, None) is None:
+            return
+
+        self._byte_size -= self._entry_bytes.pop(cache_key)
+        self._eviction_order.remove(cache_key)
 
     @staticmethod
     def _build_cache_key(start: Coordinate, end: Coordinate) -> PlannedRouteKey:
-        return PlannedRouteKey(
-            start_northing=start.northing,
-            start_easting=start.easting,
-            end_northing=end.northing,
-            end_easting=end.easting,
-        )
+        return PlannedRouteKey(start.northing, start.easting, end.northing, end.easting)
 
     @staticmethod
-    def _freeze_planned_route(route: list[Coordinate], altitudes: list[float]) -> StoredPlannedRoute:
-        frozen_route_coordinates = tuple(
-            (coordinate.northing, coordinate.easting)
-            for coordinate in route
-        )
-        frozen_altitudes = tuple(altitudes)
-        return StoredPlannedRoute(
-            route_coordinates=frozen_route_coordinates,
-            altitudes=frozen_altitudes,
-        )
+    def _estimate_entry_bytes(stored_planned_route: PlannedRoute) -> int:
+        key_bytes = sys.getsizeof(PlannedRouteKey(0.0, 0.0, 0.0, 0.0)) + 4 * FLOAT_SIZE_BYTES
+
+        if isinstance(stored_planned_route, StraightLineTrajectory):
+            return key_bytes + sys.getsizeof(stored_planned_route) + 4 * FLOAT_SIZE_BYTES
+
+        return key_bytes + sys.getsizeof(stored_planned_route)
+
+    @staticmethod
+    def _freeze_planned_route(planned_route: PlannedRoute) -> PlannedRoute:
+        if isinstance(planned_route, StraightLineTrajectory):
+            return planned_route
+
+        frozen_route = np.array(planned_route, dtype=np.float64, order="C", copy=True)
+        frozen_route.flags.writeable = False
+        return frozen_route
 
     @staticmethod
-    def _restore_planned_route(stored_planned_route: StoredPlannedRoute) -> tuple[list[Coordinate], list[float]]:
-        restored_route = [
-            Coordinate(northing=northing, easting=easting)
-            for northing, easting in stored_planned_route.route_coordinates
-        ]
-        restored_altitudes = list(stored_planned_route.altitudes)
-        return restored_route, restored_altitudes
\ No newline at end of file
+    def _restore_planned_route(stored_planned_route: PlannedRoute) -> PlannedRoute:
+        # stored arrays are read-only, so every hit can share the same buffer
+        return stored_planned_route
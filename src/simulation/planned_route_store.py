@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from common.file_utils import exclusive_file_lock
+from common.path_configs import PATH_CONFIGS
+
+ROUTE_INDEX_DTYPE = np.dtype([
+    ("start_northing", np.float64),
+    ("start_easting", np.float64),
+    ("end_northing", np.float64),
+    ("end_easting", np.float64),
+    ("offset", np.int64),
+    ("length", np.int64),
+])
+# one waypoint of the routes file
+ROUTE_RECORD_DTYPE = np.dtype([("waypoint", np.float64, (3,))])
+
+
+@dataclass(frozen=True)
+class PlannedRouteNamespace:
+    navigation_type: str
+    weight_id: str | None
+    drone_landing: bool
+    time_step_s: int
+    speed_mps: float
+    nav_cell_m: int
+
+    @property
+    def file_stem(self) -> str:
+        weight = "".join(ch if ch.isalnum() or ch in ("-", "_", ".") else "_" for ch in str(self.weight_id))
+        return (
+            f"{self.navigation_type}__{weight}__landing{int(self.drone_landing)}"
+            f"__dt{self.time_step_s}__v{self.speed_mps:g}__nav{self.nav_cell_m}"
+        )
+
+
+class PersistentPlannedRouteStore:
+    """
+    Disk tier for PlannedRouteCache, one pair of raw append-only files per namespace:
+      <stem>.routes.bin  float64 (northing, easting, altitude) waypoints of every stored route, back to back
+      <stem>.index.bin   ROUTE_INDEX_DTYPE records pointing into the routes file
+
+    Both files are memory-mapped on first lookup, and lookups return read-only copies of the mapped routes.
+    A flush appends the new routes and then their index records while holding <stem>.lock, so writers in
+    other processes never interleave, and every indexed offset is already on disk when a reader maps the
+    index.
+    """
+
+    def __init__(self, namespace: PlannedRouteNamespace, directory: str = PATH_CONFIGS.planned_route_cache_dir):
+        self.namespace = namespace
+        self._routes_path = Path(directory) / f"{namespace.file_stem}.routes.bin"
+        self._index_path = Path(directory) / f"{namespace.file_stem}.index.bin"
+        self._lock_path = Path(directory) / f"{namespace.file_stem}.lock"
+
+        self._loaded = False
+        self._routes: np.ndarray | None = None
+        self._index: dict[tuple[float, float, float, float], tuple[int, int]] = {}
+        self._indexed_record_count = 0
+        self._pending: dict[tuple[float, float, float, float], np.ndarray] = {}
+
+    @property
+    def entry_count(self) -> int:
+        self._ensure_loaded()
+        return len(self._index) + len(self._pending)
+
+    def get(self, key: tuple[float, float, float, float]) -> np.ndarray | None:
+        self._ensure_loaded()
+
+        location = self._index.get(key)
+        if location is not None:
+            offset, length = location
+            # a copy, so no route handed out keeps the mapping alive once flush releases it
+            route = np.array(self._routes[offset:offset + length])
+            route.flags.writeable = False
+            return route
+
+        return self._pending.get(key)
+
+    def store(self, key: tuple[float, float, float, float], route: np.ndarray):
+        self._ensure_loaded()
+        if key in self._index:
+            return
+
+        self._pending[key] = route
+
+    def flush(self):
+        if not self._pending:
+            return
+
+        self._ensure_loaded()
+        self._routes_path.parent.mkdir(parents=True, exist_ok=True)
+        # this store's own mapping is released before the file grows, which Windows would otherwise refuse
+        self._routes = None
+
+        with exclusive_file_lock(self._lock_path):
+            # routes other processes appended since this store last read the index
+            self._read_index_records()
+            written_count = self._append_pending_routes()
+
+        print(f"Saved {written_count} planned routes to '{self._routes_path}'.")
+        self._pending.clear()
+        self._routes = _map_or_empty(self._routes_path, ROUTE_RECORD_DTYPE)["waypoint"]
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+
+        self._loaded = True
+        self._read_index_records()
+        self._routes = _map_or_empty(self._routes_path, ROUTE_RECORD_DTYPE)["waypoint"]
+
+    def _read_index_records(self):
+        index_records = _map_or_empty(self._index_path, ROUTE_INDEX_DTYPE)[self._indexed_record_count:]
+        self._index.update(self._build_index(index_records))
+        self._indexed_record_count += len(index_records)
+
+    @staticmethod
+    def _build_index(index_records: np.ndarray) -> dict[tuple[float, float, float, float], tuple[int, int]]:
+        keys = zip(
+            index_records["start_northing"].tolist(),
+            index_records["start_easting"].tolist(),
+            index_records["end_northing"].tolist(),
+            index_records["end_easting"].tolist(),
+        )
+        locations = zip(index_records["offset"].tolist(), index_records["length"].tolist())
+        return dict(zip(keys, locations))
+
+    def _append_pending_routes(self) -> int:
+        new_items = [(key, route) for key, route in self._pending.items() if key not in self._index]
+        if not new_items:
+            return 0
+
+        # a writer that died mid-flush can leave a partial record behind; whole records are never indexed past it
+        first_offset = _truncate_to_whole_records(self._routes_path, ROUTE_RECORD_DTYPE.itemsize)
+        _truncate_to_whole_records(self._index_path, ROUTE_INDEX_DTYPE.itemsize)
+
+        new_lengths = np.array([len(route) for _, route in new_items], dtype=np.int64)
+        new_offsets = first_offset + np.cumsum(new_lengths) - new_lengths
+
+        new_records = np.empty(len(new_items), dtype=ROUTE_INDEX_DTYPE)
+        new_keys = np.array([key for key, _ in new_items], dtype=np.float64).reshape(-1, 4)
+        for column, field_name in enumerate(ROUTE_INDEX_DTYPE.names[:4]):
+            new_records[field_name] = new_keys[:, column]
+        new_records["offset"] = new_offsets
+        new_records["length"] = new_lengths
+
+        new_routes = np.concatenate([np.asarray(route, dtype=np.float64) for _, route in new_items])
+        # routes reach the disk before the index records that point at them
+        _append_and_sync(self._routes_path, new_routes)
+        _append_and_sync(self._index_path, new_records)
+
+        self._index.update(self._build_index(new_records))
+        self._indexed_record_count += len(new_records)
+        return len(new_items)
+
+
+def _map_or_empty(path: Path, dtype: np.dtype) -> np.ndarray:
+    record_count = path.stat().st_size // dtype.itemsize if path.exists() else 0
+    # numpy refuses to map an empty file
+    if record_count == 0:
+        return np.empty(0, dtype=dtype)
+
+    return np.memmap(path, dtype=dtype, mode="r", shape=(record_count,))
+
+
+def _truncate_to_whole_records(path: Path, record_size: int) -> int:
+    if not path.exists():
+        return 0
+
+    record_count = path.stat().st_size // record_size
+    if path.stat().st_size != record_count * record_size:
+        os.truncate(path, record_count * record_size)
+    return record_count
+
+
+def _append_and_sync(path: Path, array: np.ndarray):
+    with open(path, "ab") as f:
+        f.write(np.ascontiguousarray(array).tobytes())
+        f.flush()
+        os.fsync(f.fileno())
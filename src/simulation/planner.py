@@ -4,7 +4,6 @@ from common.coordinate import Coordinate
 from common.enum import NavigationType
 from common.runtime_configs import get_simulation_config
 from route_planner.landing_planner import LandingPlanner
-from route_planner.noise_based_planner import NoiseBasedPlanner
 from route_planner.straight_line_planner import StraightLinePlanner
 from simulation.planned_route_cache import PlannedRouteCache
 
@@ -15,6 +14,7 @@ class PathPlanner:
 
         self.route_planner = self._init_route_planner(navigator_type, dataset_path)
         self.landing_planner = LandingPlanner()
+        self.use_trajectories = isinstance(self.route_planner, StraightLinePlanner)
         self.planned_route_cache = planned_route_cache
 
     @staticmethod
@@ -22,16 +22,29 @@ class PathPlanner:
         if navigator_type == NavigationType.STRAIGHT:
             return StraightLinePlanner()
 
+        # networkx and the scipy-backed route caches are only needed by noise-based navigation
+        from route_planner.noise_based_planner import NoiseBasedPlanner
+
         return NoiseBasedPlanner(dataset_path)
 
     def plan(self, start: Coordinate, end: Coordinate):
-        cached_planned_route = self._get_cached_planned_route(start, end)
-        if cached_planned_route is not None:
-            return cached_planned_route
+        return self.plan_batch([start], [end])[0]
+
+    def plan_batch(self, starts: list[Coordinate], ends: list[Coordinate]):
+        planned_routes = [self._get_cached_planned_route(start, end) for start, end in zip(starts, ends)]
+        missing = [index for index, planned_route in enumerate(planned_routes) if planned_route is None]
+        if not missing:
+            return planned_routes
+
+        missing_starts = [starts[index] for index in missing]
+        missing_ends = [ends[index] for index in missing]
+        built_routes = self._build_planned_routes(missing_starts, missing_ends)
 
-        planned_route = self._build_planned_route(start, end)
-        self._store_planned_route(start, end, planned_route)
-        return planned_route
+        for index, start, end, planned_route in zip(missing, missing_starts, missing_ends, built_routes):
+            planned_routes[index] = planned_route
+            self._store_planned_route(start, end, planned_route)
+
+        return planned_routes
 
     def _get_cached_planned_route(self, start: Coordinate, end: Coordinate):
         if self.planned_route_cache is None:
@@ -39,17 +52,15 @@ class PathPlanner:
 
         return self.planned_route_cache.get(start, end)
 
-    def _build_planned_route(self, start: Coordinate, end: Coordinate):
-        route = self.route_planner.plan_route(start, end)
-
-        padded_route = self.landing_planner.add_landing_sequence(route, start, end)
-        altitudes = self.landing_planner.assign_altitudes(padded_route)
+    def _build_planned_routes(self, starts: list[Coordinate], ends: list[Coordinate]):
+        if self.use_trajectories:
+            return self.route_planner.plan_trajectories(starts, ends, self.landing_planner.landing_steps)
 
-        return padded_route, altitudes
+        routes = self.route_planner.plan_routes(starts, ends)
+        return self.landing_planner.build_planned_routes(routes)
 
     def _store_planned_route(self, start: Coordinate, end: Coordinate, planned_route):
         if self.planned_route_cache is None:
             return
 
-        route, altitudes = planned_route
-        self.planned_route_cache.store(start, end, route, altitudes)
\ No newline at end of file
+        self.planned_route_cache.store(start, end, planned_route)
@@ -1,10 +1,17 @@
 from common.runtime_configs import get_simulation_config
-from visualiser.folium_plotter import FoliumPlotter
+
 
 class Plotter:
     def __init__(self, warehouse_locations):
         self.enabled = get_simulation_config().plot_map
-        self.plotter = FoliumPlotter(warehouse_locations) if self.enabled else None
+        self.plotter = self._create_folium_plotter(warehouse_locations) if self.enabled else None
+
+    @staticmethod
+    def _create_folium_plotter(warehouse_locations):
+        # folium, branca and matplotlib are only needed when a map is actually drawn
+        from visualiser.folium_plotter import FoliumPlotter
+
+        return FoliumPlotter(warehouse_locations)
 
     def update_drones(self, drones):
         if self.enabled:
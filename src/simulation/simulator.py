@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 from common.model_configs import model_config
+from common.path_configs import get_trajectory_log_directory
 from common.runtime_configs import get_simulation_config
+from noise.route_footprint_cache import RouteFootprintCache
 from simulation.delivery_dispatcher import DeliveryDispatcher
 from simulation.fleet import Fleet
 from simulation.noise_monitor import NoiseMonitor
+from simulation.phase_profiler import PhaseProfiler
 from simulation.planned_route_cache import PlannedRouteCache
 from simulation.plotter import Plotter
 from simulation.timer import Timer
@@ -18,6 +21,7 @@ class Simulator:
         self,
         planned_route_cache: PlannedRouteCache | None = None,
         warehouse_locations=None,
+        route_footprint_cache: RouteFootprintCache | None = None,
     ):
         self.configs = get_simulation_config()
 
@@ -26,7 +30,16 @@ class Simulator:
         selected_warehouse_locations = warehouse_locations or DEFAULT_WAREHOUSE_LOCATIONS
 
         self.timer = Timer()
-        self.noise_monitor = NoiseMonitor()
+        self.noise_monitor = NoiseMonitor(
+            self.configs.noise_engine,
+            use_route_footprints=self.configs.use_route_footprints,
+            route_footprint_cache=route_footprint_cache,
+            noise_window_s=self.configs.noise_window_s,
+            trajectory_log_directory=(
+                get_trajectory_log_directory(self.configs.trajectory_hash()) if self.configs.record_trajectory else None
+            ),
+            pipeline_noise=self.configs.pipeline_noise,
+        )
         self.fleet = Fleet(
             self.configs.number_of_drones,
             self.configs.order_dataset_path,
@@ -36,6 +49,10 @@ class Simulator:
         self.dispatcher = DeliveryDispatcher(self.configs.orders_to_process, self.configs.order_dataset_path)
         self.plotter = Plotter(selected_warehouse_locations)
 
+        self.profiler = PhaseProfiler(planned_route_cache) if self.configs.profile_phases else None
+        # picked once, so an unprofiled run calls every phase directly
+        self.measure = self.profiler.measure if self.profiler is not None else _call_phase
+
     @property
     def delivered_orders_number(self):
         return self.undelivered_orders_number - len(self.dispatcher.pending_orders) - len(self.fleet.delivering_drones)
@@ -52,30 +69,41 @@ class Simulator:
         print("Running simulation...")
         print(f"Number of drones - {self.configs.number_of_drones}\nNavigation type - {self.configs.navigator_type}")
 
-        while self.has_pending_deliveries and self.timer.running:
-            if self.configs.print_model_stats:
-                self.print_drones_statistics()
+        # a run that fails midway still stops the noise pipeline and closes the trajectory log
+        try:
+            while self.has_pending_deliveries and self.timer.running:
+                if self.configs.print_model_stats:
+                    self.print_drones_statistics()
 
-            self.process_deliveries()
+                self.process_deliveries()
 
-            self.timer.advance()
+                self.timer.advance()
 
-        self.end_simulation()
+            self.end_simulation()
+        finally:
+            self.noise_monitor.close()
 
     def process_deliveries(self):
-        self.dispatcher.process_orders(self.fleet)
+        measure = self.measure
+
+        measure("process_orders", self.dispatcher.process_orders, self.fleet)
 
-        self.fleet.plan_drones_path()
-        self.fleet.update_drones()
+        measure("plan_drones_path", self.fleet.plan_drones_path)
+        measure("update_drones", self.fleet.update_drones)
 
-        self.noise_monitor.capture(self.fleet.delivering_drones)
-        self.plotter.update_drones(self.fleet.delivering_drones)
+        measure("noise_capture", self.noise_monitor.capture, self.fleet.delivering_drones)
+        measure("plotter_update", self.plotter.update_drones, self.fleet.delivering_drones)
 
     def end_simulation(self):
-        self.noise_monitor.finish()
-        self.plotter.plot_noise_map(self.noise_monitor.impact)
+        measure = self.measure
+
+        measure("calculate_noise_cells", self.noise_monitor.calculate_noise_cells)
+        measure("combine_base_noise", self.noise_monitor.combine_with_base_noise)
+        measure("plot_noise_map", self.plotter.plot_noise_map, self.noise_monitor.impact)
 
         print("Simulation completed!")
+        if self.profiler is not None:
+            self.profiler.print_summary()
 
     def print_drones_statistics(self):
         print(f"Drone Statistics at iteration {self.timer.iteration}, time {self.timer.now}:")
@@ -83,4 +111,8 @@ class Simulator:
         print(f"  Delivered Orders: {self.delivered_orders_number}")
         print(f"  Free Drones: {len(self.fleet.free_drones)}")
         print(f"  Delivering Drones: {len(self.fleet.delivering_drones)}")
-        print(f"  Waiting Planning Drones: {len(self.fleet.waiting_planning_drones)}\n")
\ No newline at end of file
+        print(f"  Waiting Planning Drones: {len(self.fleet.waiting_planning_drones)}\n")
+
+
+def _call_phase(phase: str, function, *args):
+    return function(*args)
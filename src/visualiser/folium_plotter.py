@@ -6,6 +6,7 @@ from common.coordinate import Coordinate
 from common.model_configs import model_config
 from common.path_configs import PATH_CONFIGS
 from drones.drone import Drone
+from noise.noise_data_processor import with_base_noise_geometry
 from noise.noise_overlay_generator import create_noise_layer, get_colormap
 
 BOUNDARIES = model_config.map_boundaries
@@ -69,7 +70,7 @@ class FoliumPlotter:
     def plot_combined_noise_pollution(self, combined_noise_df):
         colormap = get_colormap(MIN_NOISE_LEVEL, MAX_NOISE_LEVEL, 'Average Noise (dB)')
 
-        noise_layer = create_noise_layer(combined_noise_df, colormap)
+        noise_layer = create_noise_layer(with_base_noise_geometry(combined_noise_df), colormap)
 
         noise_layer.add_to(self.map)
         colormap.add_to(self.map)